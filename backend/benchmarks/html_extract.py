@@ -0,0 +1,108 @@
+"""Time article extraction per site and parser on saved pages.
+
+Save a page per site first (repeat --save for several pages of one site):
+
+    uv run python -m benchmarks.html_extract --save https://kathmandupost.com/...
+
+then run the benchmark over everything in benchmarks/fixtures:
+
+    uv run python -m benchmarks.html_extract
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from src.http_client import httpmanager
+from src.scraper import (
+    annapurna_scraper,
+    himalayantime_scraper,
+    kathmandupost_scraper,
+    nepalitimes_scraper,
+    online_khabar_scrape,
+)
+from src.scraper.extract import available_parsers, extract_article
+from src.scraper.types import ArticleSelectors
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+SITES: dict[str, tuple[str, ArticleSelectors]] = {
+    "onlinekhabar": ("english.onlinekhabar.com", online_khabar_scrape.SELECTORS),
+    "kathmandupost": ("kathmandupost.com", kathmandupost_scraper.SELECTORS),
+    "himalayantimes": ("thehimalayantimes.com", himalayantime_scraper.SELECTORS),
+    "nepalitimes": ("nepalitimes.com", nepalitimes_scraper.SELECTORS),
+    "annapurna": ("theannapurnaexpress.com", annapurna_scraper.SELECTORS),
+}
+
+
+def site_for(url: str) -> str:
+    host = urlsplit(url).hostname or ""
+    for site, (domain, _) in SITES.items():
+        if host == domain or host.endswith(f".{domain}"):
+            return site
+
+    raise SystemExit(f"No scraper for {url}")
+
+
+async def save(urls: list[str]):
+    FIXTURES.mkdir(exist_ok=True)
+
+    for url in urls:
+        site = site_for(url)
+        client = httpmanager.client(url)
+        response = await client.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+
+        path = FIXTURES / f"{site}-{len(list(FIXTURES.glob(f'{site}-*.html')))}.html"
+        path.write_text(response.text, encoding="utf-8")
+        print(f"Saved {url} to {path.name} ({len(response.text) / 1024:.0f} KiB)")
+
+    await httpmanager.close()
+
+
+def run(rounds: int):
+    pages = sorted(FIXTURES.glob("*.html"))
+    if not pages:
+        raise SystemExit(f"No fixtures in {FIXTURES}; save some with --save URL")
+
+    parsers = available_parsers()
+    print(f"{'page':<22}{'KiB':>6}" + "".join(f"{p:>14}" for p in parsers))
+
+    for page in pages:
+        selectors = SITES[page.stem.split("-")[0]][1]
+        html = page.read_text(encoding="utf-8")
+
+        timings = []
+        results = []
+        for parser in parsers:
+            samples = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                result = extract_article(html, selectors, parser)
+                samples.append(time.perf_counter() - started)
+
+            timings.append(statistics.median(samples) * 1000)
+            results.append(result)
+
+        row = f"{page.name:<22}{len(html) / 1024:>6.0f}"
+        row += "".join(f"{ms:>11.2f} ms" for ms in timings)
+        if any(result != results[-1] for result in results):
+            row += "  (outputs differ)"
+        print(row)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time article extraction per site and parser on saved pages."
+    )
+    parser.add_argument("--save", metavar="URL", action="append", default=[])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.save:
+        asyncio.run(save(args.save))
+    else:
+        run(args.rounds)
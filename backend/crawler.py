@@ -0,0 +1,44 @@
+import asyncio
+import signal
+import traceback
+
+from src.config import settings
+from src.db.pg_session import sessionmanager
+from src.http_client import httpmanager
+from src.ingest import crawl_once
+from src.scraper.extract import html_extractor
+
+
+async def run_crawler(stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            ingested = await crawl_once()
+            print(f"Crawl finished, ingested {ingested} articles")
+        except Exception:
+            traceback.print_exc()
+
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.CRAWL_INTERVAL_SECONDS)
+        except TimeoutError:
+            pass
+
+
+async def main():
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Crawler started for {len(settings.CRAWL_FEEDS)} feeds")
+
+    try:
+        await run_crawler(stop)
+    finally:
+        await httpmanager.close()
+        await sessionmanager.close()
+        html_extractor.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from src.auth import router as auth_router
 from src.routes import router as sessions_router
 from src.chat import router as chat_router
+from src.db.pg_session import sessionmanager
+from src.http_client import httpmanager
+from src.scraper.article_cache import article_cache
+from src.scraper.extract import html_extractor
 from fastapi.middleware.cors import CORSMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await httpmanager.close()
+    await article_cache.drain()
+    await sessionmanager.close()
+    html_extractor.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(auth_router)
 app.include_router(sessions_router)
@@ -24,6 +40,11 @@ async def root():
     return {"message": "Hello World"}
 
 
+@app.get("/health/db")
+async def db_health():
+    return sessionmanager.pool_status()
+
+
 if __name__ == "__main__":
     import uvicorn
 
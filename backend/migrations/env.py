@@ -12,6 +12,11 @@ from alembic import context
 # Import models so Alembic can detect them
 from src.db.models import ChatSession  # noqa
 from src.db.models import ChatMessage  # noqa
+from src.db.models import Article  # noqa
+from src.db.models import ArticleSummary  # noqa
+from src.db.models import ChatJob  # noqa
+from src.db.models import CrawlCheckpoint  # noqa
+from src.db.models import IntentVerdict  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,45 @@
+"""session listing index and last message preview
+
+Revision ID: 2f6d9a4c1b83
+Revises: e5a8b7c61d04
+Create Date: 2026-10-18 15:41:19.274406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f6d9a4c1b83'
+down_revision: Union[str, Sequence[str], None] = 'e5a8b7c61d04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('chat_sessions', sa.Column('last_message_preview', sa.String(), nullable=True))
+    op.create_index('idx_chat_sessions_user_updated', 'chat_sessions', ['user_id', sa.text('updated_at DESC')], unique=False)
+
+    # Backfill previews and activity timestamps from existing messages.
+    op.execute(
+        """
+        UPDATE chat_sessions
+        SET last_message_preview = left(latest.content, 200),
+            updated_at = latest.created_at
+        FROM (
+            SELECT DISTINCT ON (session_id) session_id, content, created_at
+            FROM chat_messages
+            ORDER BY session_id, created_at DESC
+        ) AS latest
+        WHERE latest.session_id = chat_sessions.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_chat_sessions_user_updated', table_name='chat_sessions')
+    op.drop_column('chat_sessions', 'last_message_preview')
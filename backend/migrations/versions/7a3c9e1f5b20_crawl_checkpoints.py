@@ -0,0 +1,39 @@
+"""crawl checkpoints and article publish dates
+
+Revision ID: 7a3c9e1f5b20
+Revises: 2f6d9a4c1b83
+Create Date: 2026-10-18 16:52:40.118273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a3c9e1f5b20'
+down_revision: Union[str, Sequence[str], None] = '2f6d9a4c1b83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('crawl_checkpoints',
+    sa.Column('feed_url', sa.String(), nullable=False),
+    sa.Column('etag', sa.String(), nullable=True),
+    sa.Column('last_modified', sa.String(), nullable=True),
+    sa.Column('last_entry_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_crawled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('feed_url')
+    )
+    op.add_column('articles', sa.Column('published_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('articles', 'published_at')
+    op.drop_table('crawl_checkpoints')
@@ -0,0 +1,31 @@
+"""article full-text search vector
+
+Revision ID: b8e4d2a6c915
+Revises: 7a3c9e1f5b20
+Create Date: 2026-10-18 17:36:08.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e4d2a6c915'
+down_revision: Union[str, Sequence[str], None] = '7a3c9e1f5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('articles', sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed("setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B')", persisted=True), nullable=True))
+    op.create_index('idx_articles_search_vector', 'articles', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_articles_search_vector', table_name='articles', postgresql_using='gin')
+    op.drop_column('articles', 'search_vector')
@@ -0,0 +1,28 @@
+"""chat jobs session index
+
+Revision ID: f1b7c4e9d253
+Revises: c3d9f7a2e416
+Create Date: 2026-10-19 10:22:41.608135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7c4e9d253'
+down_revision: Union[str, Sequence[str], None] = 'c3d9f7a2e416'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('idx_chat_jobs_session_created', 'chat_jobs', ['session_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_chat_jobs_session_created', table_name='chat_jobs')
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr
 from src.supabase import supabase_client
 
@@ -18,8 +19,9 @@ class LoginRequest(BaseModel):
 @router.post("/signup")
 async def signup(request: SignupRequest):
     try:
-        response = supabase_client.auth.sign_up(
-            {"email": request.email, "password": request.password}
+        response = await run_in_threadpool(
+            supabase_client.auth.sign_up,
+            {"email": request.email, "password": request.password},
         )
 
         if response.user:
@@ -38,8 +40,9 @@ async def signup(request: SignupRequest):
 @router.post("/login")
 async def login(request: LoginRequest):
     try:
-        response = supabase_client.auth.sign_in_with_password(
-            {"email": request.email, "password": request.password}
+        response = await run_in_threadpool(
+            supabase_client.auth.sign_in_with_password,
+            {"email": request.email, "password": request.password},
         )
 
         if response.user and response.session:
@@ -1,27 +1,30 @@
 import asyncio
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+import json
+import time
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from contextlib import aclosing
+from typing import Literal, TypedDict
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from uuid import UUID
+from uuid import UUID, uuid4
 from src.llm.intent import validate_news_query
-from src.llm.answer import generate_answer
-
-from supabase import acreate_client
-
-from src.db.pg_session import get_db_session
-from src.db.models.chat_sesion import ChatSession
-from src.db.models.chat_message import ChatMessage
-from src.dependencies import get_current_user
-from src.scraper.annapurna_scraper import scrape_news as scrape_annapurna
-from src.scraper.online_khabar_scrape import scrape_news as scrape_online_khabar
-from src.scraper.kathmandupost_scraper import scrape_news as scrape_kathmandupost
-from src.scraper.himalayantime_scraper import scrape_news as scrape_himalayantimes
-from src.scraper.nepalitimes_scraper import scrape_news as scrape_nepalitimes
-from src.scraper.google_search import NewsArticle, search_nepal_news
-from src.llm.summarizer import summarize
+from src.llm.intent_classifier import normalize_query
+from src.llm.answer import AnswerInterrupted, stream_answer
+
+from src.db.pg_session import get_db_session, sessionmanager
+from src.dependencies import (
+    find_owned_session,
+    get_current_user,
+    get_read_db_session,
+)
+from src.jobs import enqueue_chat_job
+from src.message_buffer import MessageBuffer
+from src.realtime import realtimemanager
+from src.pipeline import SpeculativeSearch, collect_summaries, search_focus
 from src.config import settings
-from src.scraper.types import ScrapedNews
+from src.singleflight import SingleFlight
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -39,103 +42,119 @@ class DirectChatResponse(BaseModel):
     answer: str
 
 
-async def send_message(channel, db: AsyncSession, session_id: UUID, content: str):
-    await channel.send_broadcast(
+async def send_message(messages: MessageBuffer, session_id: UUID, content: str):
+    message_id = messages.add(session_id, "assistant", content)
+
+    await realtimemanager.broadcast(
+        str(session_id),
         event="message-broadcast",
         data={
+            "type": "end",
+            "message_id": str(message_id),
             "session_id": str(session_id),
             "role": "assistant",
             "content": content,
         },
     )
 
-    message = ChatMessage(
-        session_id=session_id,
-        role="assistant",
-        content=content,
-    )
-    db.add(message)
-    await db.commit()
-
-
-async def scrape_link(article: NewsArticle) -> ScrapedNews | None:
-    link = article["link"]
-    source = ""
-
-    if "english.onlinekhabar.com" in link:
-        result = await scrape_online_khabar(link)
-        source = "Online Khabar"
-    elif "kathmandupost.com" in link:
-        result = await scrape_kathmandupost(link)
-        source = "The Kathmandu Post"
-    elif "thehimalayantimes.com" in link:
-        result = await scrape_himalayantimes(link)
-        source = "The Himalayan Times"
-    elif "nepalitimes.com" in link:
-        result = await scrape_nepalitimes(link)
-        source = "Nepali Times"
-    elif "theannapurnaexpress.com" in link:
-        result = await scrape_annapurna(link)
-        source = "The Annapurna Express"
-    else:
-        print(f"No scraper available for: {link}")
-        return None
-
-    if result:
-        return ScrapedNews(
-            title=result["heading"],
-            body=result["body"],
-            date=article["date"],
-            source=source,
-            link=article["link"],
+
+async def send_stream(
+    messages: MessageBuffer,
+    session_id: UUID,
+    chunks: AsyncIterator[str],
+) -> str:
+    """Broadcast a streamed answer, throttled, and buffer its final text."""
+    message_id = uuid4()
+    content = ""
+    last_broadcast = 0.0
+
+    async def broadcast(type: str):
+        await realtimemanager.broadcast(
+            str(session_id),
+            event="message-broadcast",
+            data={
+                "type": type,
+                "message_id": str(message_id),
+                "session_id": str(session_id),
+                "role": "assistant",
+                "content": content,
+            },
         )
 
-    return None
+    try:
+        async for delta in chunks:
+            if not content:
+                content = delta
+                await broadcast("start")
+                last_broadcast = time.monotonic()
+                continue
 
+            content += delta
+            if time.monotonic() - last_broadcast >= settings.ANSWER_STREAM_INTERVAL:
+                await broadcast("chunk")
+                last_broadcast = time.monotonic()
+    except AnswerInterrupted as e:
+        content = str(e)
 
-async def scrape_articles(news_articles: list[NewsArticle]) -> list[ScrapedNews]:
-    scraped_articles = await asyncio.gather(
-        *[scrape_link(article) for article in news_articles]
-    )
-    return [article for article in scraped_articles if article is not None]
+    if not content:
+        return content
 
+    await broadcast("end")
+    messages.add(session_id, "assistant", content, message_id=message_id)
 
-async def summarize_articles(articles: list[ScrapedNews]) -> list[str]:
-    summaries = await asyncio.gather(
-        *[
-            summarize(
-                {
-                    "heading": article["title"],
-                    "body": article["body"],
-                }
-            )
-            for article in articles
-        ]
-    )
-    return [summary for summary in summaries if summary is not None]
+    return content
 
 
-async def start_chat_flow(
-    session_id: UUID,
-    user_query: str,
-    db: AsyncSession,
-):
+class ChatEvent(TypedDict):
+    # "message": a complete assistant message. "delta": the next piece of the
+    # streamed answer. "end": the streamed answer is complete. "error": the
+    # streamed answer broke off; its content replaces the partial answer.
+    type: Literal["message", "delta", "end", "error"]
+    content: str
+
+
+def chat_message(content: str) -> ChatEvent:
+    return {"type": "message", "content": content}
+
+
+async def answer_events(
+    user_query: str, summaries_with_sources: list[dict[str, str]], mrkdwn: bool
+) -> AsyncIterator[ChatEvent]:
+    failure_message = (
+        "something went wrong while generating the final response :("
+        if mrkdwn
+        else "Something went wrong while generating the final response. Please try again."
+    )
+
+    answered = False
     try:
-        client = await acreate_client(settings.SUPABASE_URL, settings.SUPABASE_API_KEY)
-        channel = client.channel(str(session_id))
-        await channel.subscribe()
+        async for delta in stream_answer(user_query, summaries_with_sources, mrkdwn):
+            answered = True
+            yield {"type": "delta", "content": delta}
+    except AnswerInterrupted:
+        print("Final answer was interrupted")
+        yield {"type": "error", "content": failure_message}
+        return
+
+    if answered:
+        yield {"type": "end", "content": ""}
+        print("Final answer sent to user")
+    else:
+        print("Failed to generate final answer")
+        yield chat_message(failure_message)
+
+
+async def chat_flow_events(user_query: str) -> AsyncGenerator[ChatEvent, None]:
+    """The session chat flow for one query, as events for any session to show."""
+    search = SpeculativeSearch(user_query)
 
+    try:
         intent_output = await validate_news_query(user_query=user_query)
         if not intent_output.is_valid:
             print(
                 f"invalid question recieved:  {user_query}, reason: {intent_output.reason}, clarification message: {intent_output.clarification_message}"
             )
-            await send_message(
-                channel,
-                db,
-                session_id,
-                intent_output.clarification_message,
-            )
+            yield chat_message(intent_output.clarification_message)
             return
 
         searching_message = """Searching for news in the following sites:
@@ -144,18 +163,13 @@ async def start_chat_flow(
 - [The Himalayan Times](https://thehimalayantimes.com)
 - [Nepali Times](https://nepalitimes.com)
 - [The Annapurna Express](https://theannapurnaexpress.com)"""
-        await send_message(channel, db, session_id, searching_message)
+        yield chat_message(searching_message)
 
-        news_articles = await search_nepal_news(user_query)
+        news_articles = await search.results(intent_output)
 
         if not news_articles:
-            await send_message(
-                channel,
-                db,
-                session_id,
-                "No particular news was found regarding your query.",
-            )
             print("No news articles found")
+            yield chat_message("No particular news was found regarding your query.")
             return
 
         print(f"Found {len(news_articles)} news articles")
@@ -164,82 +178,118 @@ async def start_chat_flow(
             [f"- [{article['title']}]({article['link']})" for article in news_articles]
         )
         checking_message = f"Found {len(news_articles)} articles. Checking the following:\n\n{links_list}"
-        await send_message(channel, db, session_id, checking_message)
+        yield chat_message(checking_message)
 
-        valid_articles = await scrape_articles(news_articles)
+        scraped_count, summaries_with_sources = await collect_summaries(
+            news_articles, search.prefetched, search_focus(user_query, intent_output)
+        )
 
-        if not valid_articles:
+        if not scraped_count:
             print("No articles could be scraped")
-            await send_message(
-                channel,
-                db=db,
-                session_id=session_id,
-                content="something went wrong while getting news articles :(",
-            )
+            yield chat_message("something went wrong while getting news articles :(")
+            return
+
+        print(f"Successfully scraped {scraped_count} articles")
+
+        curating_message = f"Finished summarizing {len(summaries_with_sources)} articles. Creating a final response for you..."
+        yield chat_message(curating_message)
+
+        if not summaries_with_sources:
+            print("No summaries were generated")
             return
 
-        print(f"Successfully scraped {len(valid_articles)} articles")
+        async for event in answer_events(user_query, summaries_with_sources, True):
+            yield event
 
-        summarizing_message = f"Summarizing {len(valid_articles)} articles..."
-        await send_message(channel, db, session_id, summarizing_message)
+    finally:
+        search.cancel()
 
-        summaries = await summarize_articles(valid_articles)
 
-        curating_message = "Finished summarizing. Creating a final response for you..."
-        await send_message(channel, db, session_id, curating_message)
+# Runs of a flow in progress, by normalized query and output format.
+chat_flights: SingleFlight[tuple[str, bool], ChatEvent] = SingleFlight()
 
-        summaries_with_sources = [
-            {"source": article["source"], "summary": summary, "link": article["link"]}
-            for article, summary in zip(valid_articles, summaries)
-            if summary is not None
-        ]
 
-        if not summaries_with_sources:
-            print("No summaries were generated")
+def coalesced_events(
+    user_query: str,
+    mrkdwn: bool,
+    run: Callable[[str], AsyncGenerator[ChatEvent, None]],
+) -> AsyncGenerator[ChatEvent, None]:
+    """The events of `run(user_query)`, shared with identical concurrent queries."""
+    if not settings.CHAT_COALESCE:
+        return run(user_query)
+
+    key = (normalize_query(user_query), mrkdwn)
+    if chat_flights.in_flight(key):
+        print(f"Joining the in-flight answer for: {user_query}")
+
+    return chat_flights.join(key, lambda: run(user_query))
+
+
+async def answer_deltas(
+    first: str, events: AsyncIterator[ChatEvent]
+) -> AsyncIterator[str]:
+    """The streamed answer: `first`, then the deltas in `events` up to its end."""
+    yield first
+    async for event in events:
+        if event["type"] == "end":
             return
+        if event["type"] == "error":
+            raise AnswerInterrupted(event["content"])
+        yield event["content"]
 
-        final_answer = await generate_answer(user_query, summaries_with_sources)
-
-        if final_answer:
-            await send_message(channel, db, session_id, final_answer)
-            print("Final answer sent to user")
-        else:
-            await send_message(
-                channel,
-                db,
-                session_id,
-                "something went wrong while generating the final response :(",
-            )
-            print("Failed to generate final answer")
 
+async def start_chat_flow(
+    session_id: UUID,
+    user_query: str,
+    db: AsyncSession,
+    final_attempt: bool = True,
+):
+    """Answer one chat query; errors propagate unless it is the `final_attempt`."""
+    messages = MessageBuffer(db)
+
+    try:
+        async with aclosing(
+            coalesced_events(user_query, True, chat_flow_events)
+        ) as events:
+            async for event in events:
+                if event["type"] == "message":
+                    await send_message(messages, session_id, event["content"])
+                elif event["type"] == "delta":
+                    await send_stream(
+                        messages, session_id, answer_deltas(event["content"], events)
+                    )
+
+    except asyncio.CancelledError:
+        # Timed out: likewise keep a retried attempt's messages out.
+        if not final_attempt:
+            messages.discard()
+        raise
     except Exception as e:
+        print(f"Error in chat flow: {e}")
+        if not final_attempt:
+            # The retry sends its progress messages again; don't store these.
+            messages.discard()
+            raise
+
         await send_message(
-            channel,
-            db,
+            messages,
             session_id,
             "Something went wrong while generating your response.",
         )
-        print(f"Error in chat flow: {e}")
     finally:
-        await channel.unsubscribe()
+        await messages.flush()
 
 
 @router.post("/{session_id}/chat", response_model=ChatResponse)
 async def chat(
     session_id: UUID,
     request: ChatRequest,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db_session),
+    read_db: AsyncSession = Depends(get_read_db_session),
     current_user=Depends(get_current_user),
 ):
     try:
-        result = await db.execute(
-            select(ChatSession).where(
-                ChatSession.id == session_id,
-                ChatSession.user_id == UUID(current_user.id),
-            )
-        )
-        session = result.scalar_one_or_none()
+        session, _ = await find_owned_session(session_id, current_user.id, read_db, db)
 
         if not session:
             raise HTTPException(
@@ -247,11 +297,13 @@ async def chat(
                 detail="Session not found or you don't have access to it",
             )
 
-        background_tasks.add_task(
-            start_chat_flow,
-            session_id=session_id,
-            user_query=request.user_query,
-            db=db,
+        await enqueue_chat_job(db, session_id, request.user_query)
+        # The worker writes this session's messages for as long as the flow
+        # runs; keep its history (and the user's session list) on the primary.
+        sessionmanager.mark_written(
+            session_id,
+            current_user.id,
+            window=settings.JOB_TIMEOUT_SECONDS + settings.DB_READ_YOUR_WRITES_SECONDS,
         )
 
         return ChatResponse(message="Chat processing started", session_id=session_id)
@@ -262,54 +314,74 @@ async def chat(
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/direct", response_model=DirectChatResponse)
-async def direct_chat(request: ChatRequest):
+async def direct_summaries(
+    user_query: str,
+) -> tuple[list[dict[str, str]], str | None]:
+    """Summaries to answer from, or a message saying why there are none."""
+    search = SpeculativeSearch(user_query)
+
     try:
-        intent_result = await validate_news_query(request.user_query)
+        intent_result = await validate_news_query(user_query)
 
         if not intent_result.is_valid:
-            return DirectChatResponse(
-                answer=intent_result.clarification_message,
-            )
+            return [], intent_result.clarification_message
 
-        news_articles = await search_nepal_news(request.user_query)
+        news_articles = await search.results(intent_result)
 
         if not news_articles:
-            return DirectChatResponse(
-                answer="Something went wrong while searching for news articles. Please try again.",
+            return (
+                [],
+                "Something went wrong while searching for news articles. Please try again.",
             )
 
-        valid_articles = await scrape_articles(news_articles)
+        scraped_count, summaries_with_sources = await collect_summaries(
+            news_articles, search.prefetched, search_focus(user_query, intent_result)
+        )
+    finally:
+        search.cancel()
 
-        if not valid_articles:
-            return DirectChatResponse(
-                answer="Something went wrong while scraping the articles. Please try again.",
-            )
+    if not scraped_count:
+        return (
+            [],
+            "Something went wrong while scraping the articles. Please try again.",
+        )
 
-        summaries = await summarize_articles(valid_articles)
+    if not summaries_with_sources:
+        return (
+            [],
+            "Something went wrong while generating summaries. Please try again.",
+        )
 
-        summaries_with_sources = [
-            {"source": article["source"], "summary": summary, "link": article["link"]}
-            for article, summary in zip(valid_articles, summaries)
-            if summary is not None
-        ]
+    return summaries_with_sources, None
 
-        if not summaries_with_sources:
-            return DirectChatResponse(
-                answer="Something went wrong while generating summaries. Please try again.",
-            )
 
-        final_answer = await generate_answer(
-            request.user_query, summaries_with_sources, mrkdwn=False
-        )
+async def direct_events(user_query: str) -> AsyncGenerator[ChatEvent, None]:
+    """The direct chat flow for one query: a single message, or the answer."""
+    summaries_with_sources, message = await direct_summaries(user_query)
 
-        if not final_answer:
-            return DirectChatResponse(
-                answer="Something went wrong while generating the final response. Please try again.",
-            )
+    if message is not None:
+        yield chat_message(message)
+        return
+
+    async for event in answer_events(user_query, summaries_with_sources, False):
+        yield event
+
+
+@router.post("/direct", response_model=DirectChatResponse)
+async def direct_chat(request: ChatRequest):
+    try:
+        answer = ""
+        async with aclosing(
+            coalesced_events(request.user_query, False, direct_events)
+        ) as events:
+            async for event in events:
+                if event["type"] == "error":
+                    answer = event["content"]
+                else:
+                    answer += event["content"]
 
         return DirectChatResponse(
-            answer=final_answer,
+            answer=answer,
         )
 
     except Exception as e:
@@ -317,3 +389,42 @@ async def direct_chat(request: ChatRequest):
         return DirectChatResponse(
             answer="Something went wrong while processing your request. Please try again.",
         )
+
+
+def sse_event(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/direct/stream")
+async def direct_chat_stream(request: ChatRequest):
+    """Server-sent events variant of /direct."""
+
+    async def events() -> AsyncIterator[str]:
+        answer = ""
+        try:
+            async with aclosing(
+                coalesced_events(request.user_query, False, direct_events)
+            ) as chat_events:
+                async for event in chat_events:
+                    if event["type"] == "error":
+                        answer = event["content"]
+                        yield sse_event({"message": answer}, event="error")
+                    elif event["content"]:
+                        answer += event["content"]
+                        yield sse_event({"delta": event["content"]})
+
+        except Exception as e:
+            print(f"Error in direct chat stream: {e}")
+            answer = (
+                "Something went wrong while processing your request. Please try again."
+            )
+            yield sse_event({"delta": answer})
+
+        yield sse_event({"answer": answer}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,12 +4,138 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     SUPABASE_URL: str
     SUPABASE_API_KEY: str
+    # Legacy HS256 secret; projects on asymmetric keys verify through JWKS.
+    SUPABASE_JWT_SECRET: str | None = None
+    SUPABASE_JWT_AUDIENCE: str = "authenticated"
+    SUPABASE_JWKS_TTL_SECONDS: float = 10 * 60
+    AUTH_TOKEN_CACHE_MAXSIZE: int = 10_000
     POSTGRES_URI: str
     POSTGRES_URI_ORM: str
+    # Optional read replica for history and session reads. Reads for a chat
+    # session or user stay on the primary for a while after this process
+    # writes to it.
+    POSTGRES_URI_ORM_REPLICA: str | None = None
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
     SERPER_API_KEY: str
     SERPER_API_URL: str = "https://google.serper.dev/search"
+    # "serper", "local" (full-text search over stored articles) or "tiered"
+    # (local first, Serper when that finds too little).
+    SEARCH_BACKEND: str = "tiered"
+    SEARCH_MAX_RESULTS: int = 10
+    LOCAL_SEARCH_MIN_RESULTS: int = 5
+    LOCAL_SEARCH_RECENCY_DAYS: float = 7.0
     OPENAI_KEY: str
 
+    # SQLAlchemy pool for POSTGRES_URI_ORM. DB_PGBOUNCER disables prepared
+    # statement caching, which Supabase's pooler in transaction mode breaks.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    DB_PGBOUNCER: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+    # Checkouts that wait longer than this are logged.
+    DB_SLOW_CHECKOUT_SECONDS: float = 0.5
+
+    # Shared outbound HTTP client (scrapers and Serper). Limits are per host;
+    # the HOST_* maps override the defaults for individual hostnames.
+    HTTP_HTTP2: bool = True
+    HTTP_MAX_CONNECTIONS: int = 10
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_HOST_MAX_CONNECTIONS: dict[str, int] = {}
+    HTTP_HOST_TIMEOUTS: dict[str, float] = {"google.serper.dev": 30.0}
+
+    # Article extraction backend ("selectolax", "lxml" or "html.parser") and
+    # the pool parses run in ("thread" or "process").
+    HTML_PARSER: str = "selectolax"
+    HTML_PARSE_EXECUTOR: str = "thread"
+    HTML_PARSE_WORKERS: int = 4
+    # Stream article pages and stop reading once the body container closes.
+    SCRAPE_STREAMING: bool = True
+    SCRAPE_MAX_BYTES: int = 2 * 1024 * 1024
+
+    ARTICLE_CACHE_MAXSIZE: int = 1024
+    ARTICLE_CACHE_TTL_SECONDS: float = 24 * 60 * 60
+
+    SUMMARY_CACHE_MAXSIZE: int = 2048
+    # Article bodies longer than this many input tokens are compressed
+    # extractively before summarizing; the map overrides it per model.
+    SUMMARIZER_INPUT_TOKEN_BUDGET: int = 3000
+    SUMMARIZER_INPUT_TOKEN_BUDGETS: dict[str, int] = {}
+    # "llm" summarizes with the model; "extractive" always uses the local
+    # TextRank summarizer. In "llm" mode, bodies of at most
+    # SUMMARIZER_FAST_PATH_MAX_WORDS words are summarized locally, and so is
+    # everything not already cached once SUMMARIZER_DEGRADE_BACKLOG summaries
+    # are queued for a PIPELINE_SUMMARIZE_CONCURRENCY slot (0 disables both).
+    SUMMARIZER_MODE: str = "llm"
+    SUMMARIZER_FAST_PATH_MAX_WORDS: int = 250
+    SUMMARIZER_DEGRADE_BACKLOG: int = 20
+    SUMMARIZER_EXTRACTIVE_SENTENCES: int = 5
+
+    PIPELINE_SCRAPE_CONCURRENCY: int = 20
+    PIPELINE_SUMMARIZE_CONCURRENCY: int = 10
+
+    # BM25 relevance cut-off on title and snippet: the search results listed
+    # to the user, then scraped and summarized. Ranking before scraping lets
+    # each article be summarized as soon as it arrives.
+    RANK_SCRAPE_TOP_K: int = 5
+
+    # Articles whose 64-bit SimHashes differ in at most this many bits share
+    # one summary. Bodies shorter than DEDUP_MIN_TOKENS words are never merged.
+    DEDUP_MAX_DISTANCE: int = 4
+    DEDUP_MIN_TOKENS: int = 50
+
+    # Intent tiers in front of the LLM: rules, cached LLM verdicts, then the
+    # hashed n-gram model at INTENT_MODEL_PATH (written by train_intent.py),
+    # which only decides queries it is at least this confident about.
+    INTENT_CACHE_MAXSIZE: int = 4096
+    INTENT_MODEL_PATH: str = ""
+    INTENT_LOCAL_VALID_CONFIDENCE: float = 0.99
+    INTENT_LOCAL_INVALID_CONFIDENCE: float = 0.97
+
+    # Identical concurrent queries (same normalized text and output format)
+    # share one run of the chat flow, fanned out to every requester.
+    CHAT_COALESCE: bool = True
+
+    # Start the news search (and optionally the scrapes) while the intent
+    # check is still running; the work is cancelled if the query is invalid.
+    SPECULATIVE_SEARCH: bool = False
+    SPECULATIVE_SCRAPE: bool = False
+
+    REALTIME_MAX_CHANNELS: int = 500
+    REALTIME_CONNECT_TIMEOUT: float = 5.0
+    REALTIME_RETRY_INTERVAL: float = 30.0
+
+    # Chat job worker (worker.py).
+    JOB_WORKER_CONCURRENCY: int = 8
+    JOB_POLL_INTERVAL: float = 0.5
+    JOB_TIMEOUT_SECONDS: float = 180.0
+    JOB_LEASE_SECONDS: float = 300.0
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0
+
+    # Ingestion crawler (crawler.py): RSS feeds and sitemaps of the outlets
+    # we scrape, walked every CRAWL_INTERVAL_SECONDS.
+    CRAWL_FEEDS: list[str] = [
+        "https://english.onlinekhabar.com/feed",
+        "https://kathmandupost.com/rss",
+        "https://thehimalayantimes.com/sitemap.xml",
+        "https://nepalitimes.com/sitemap.xml",
+        "https://theannapurnaexpress.com/sitemap.xml",
+    ]
+    CRAWL_INTERVAL_SECONDS: float = 15 * 60
+    CRAWL_CONCURRENCY: int = 4
+    CRAWL_MAX_ARTICLES_PER_FEED: int = 50
+    CRAWL_MAX_CHILD_SITEMAPS: int = 2
+
+    # Minimum seconds between realtime broadcasts of a streaming answer.
+    ANSWER_STREAM_INTERVAL: float = 0.1
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,2 +1,7 @@
 from src.db.models.chat_message import ChatMessage
 from src.db.models.chat_sesion import ChatSession
+from src.db.models.article import Article
+from src.db.models.article_summary import ArticleSummary
+from src.db.models.chat_job import ChatJob
+from src.db.models.crawl_checkpoint import CrawlCheckpoint
+from src.db.models.intent_verdict import IntentVerdict
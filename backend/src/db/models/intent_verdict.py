@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+
+from .base import Base
+
+
+class IntentVerdict(Base):
+    __tablename__ = "intent_verdicts"
+
+    query_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Normalized query text; the local intent classifier is trained on it.
+    query: Mapped[str] = mapped_column(String, nullable=False)
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String, nullable=False)
+    is_valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    # The full IntentOutput as JSON.
+    verdict: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
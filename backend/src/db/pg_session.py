@@ -1,31 +1,191 @@
 import contextlib
+import time
 from collections.abc import AsyncIterator
-from typing import Any
+from typing import Any, cast
+from uuid import uuid4
 
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from src.cache import LRUCache
 from src.config import settings
 
+RECENT_WRITES_MAXSIZE = 10_000
+
+
+class PoolMetrics:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self, slow_threshold: float):
+        self.slow_threshold = slow_threshold
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.timeouts += timed_out
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+        if timed_out or waited >= self.slow_threshold:
+            print(
+                f"Slow database checkout: waited {waited:.3f}s"
+                f"{' and timed out' if timed_out else ''}"
+            )
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait": self.total_wait / self.checkouts if self.checkouts else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """The default async pool, timing every checkout (including pre-ping)."""
+
+    metrics: PoolMetrics
+
+    def connect(self):
+        started = time.monotonic()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.monotonic() - started, timed_out=True)
+            raise
+
+        self.metrics.record(time.monotonic() - started)
+        return connection
+
+    def recreate(self) -> "MeteredQueuePool":
+        # Pool.recreate() builds the same class, so the copy is metered too.
+        pool = cast(MeteredQueuePool, super().recreate())
+        pool.metrics = self.metrics
+        return pool
+
+
+def engine_kwargs() -> dict[str, Any]:
+    connect_args: dict[str, Any] = {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER:
+        # pgbouncer in transaction mode hands each transaction whichever
+        # server connection is free, so statements prepared on one aren't
+        # there on the next. Don't cache them, and give each a unique name
+        # so concurrent clients never collide on a server connection.
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
 
 class DatabaseSessionManager:
-    def __init__(self, db_uri: str, engine_kwargs: dict[str, Any]):
+    """Sessions on the primary, plus read sessions on an optional replica.
+
+    `read_session(*keys)` goes to the replica unless one of `keys` (session or
+    user ids) was passed to `mark_written` within its window, so a client
+    always reads back its own writes even while the replica lags.
+    """
+
+    def __init__(
+        self,
+        db_uri: str,
+        engine_kwargs: dict[str, Any],
+        replica_uri: str | None = None,
+        read_your_writes_window: float = 0.0,
+    ):
         self._engine = create_async_engine(db_uri, **engine_kwargs)
         self._sessionmaker = async_sessionmaker(
             autocommit=False, autoflush=False, bind=self._engine
         )
+        self.metrics = self._meter(self._engine)
+
+        self._replica_engine = None
+        self._replica_sessionmaker = None
+        self.replica_metrics = None
+        if replica_uri:
+            self._replica_engine = create_async_engine(replica_uri, **engine_kwargs)
+            self._replica_sessionmaker = async_sessionmaker(
+                autocommit=False, autoflush=False, bind=self._replica_engine
+            )
+            self.replica_metrics = self._meter(self._replica_engine)
+
+        self._recent_writes: LRUCache[str, bool] = LRUCache(
+            RECENT_WRITES_MAXSIZE, ttl=read_your_writes_window
+        )
+
+    def _meter(self, engine: AsyncEngine) -> PoolMetrics:
+        metrics = PoolMetrics(settings.DB_SLOW_CHECKOUT_SECONDS)
+        if isinstance(engine.pool, MeteredQueuePool):
+            engine.pool.metrics = metrics
+
+        return metrics
+
+    def pool_status(self) -> dict[str, Any]:
+        if self._engine is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+
+        engines = {"primary": (self._engine, self.metrics)}
+        if self._replica_engine is not None and self.replica_metrics is not None:
+            engines["replica"] = (self._replica_engine, self.replica_metrics)
+
+        status: dict[str, Any] = {}
+        for name, (engine, metrics) in engines.items():
+            pool = engine.pool
+            status[name] = metrics.snapshot()
+            if isinstance(pool, AsyncAdaptedQueuePool):
+                status[name].update(
+                    size=pool.size(),
+                    checked_out=pool.checkedout(),
+                    overflow=pool.overflow(),
+                )
+
+        return status
+
+    def mark_written(self, *keys: Any, window: float | None = None):
+        """Pin reads for `keys` to the primary for `window` seconds."""
+        if self._replica_engine is None:
+            return
+
+        for key in keys:
+            self._recent_writes.set(str(key), True, ttl=window)
+
+    def recently_written(self, *keys: Any) -> bool:
+        return any(self._recent_writes.get(str(key)) for key in keys)
 
     async def close(self):
         if self._engine is None:
             raise Exception("DatabaseSessionManager is not initialized")
         await self._engine.dispose()
+        if self._replica_engine is not None:
+            await self._replica_engine.dispose()
 
         self._engine = None
         self._sessionmaker = None
+        self._replica_engine = None
+        self._replica_sessionmaker = None
 
     @contextlib.asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -40,11 +200,15 @@ class DatabaseSessionManager:
                 raise
 
     @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
+    async def session(self, replica: bool = False) -> AsyncIterator[AsyncSession]:
         if self._sessionmaker is None:
             raise Exception("DatabaseSessionManager is not initialized")
 
-        session = self._sessionmaker()
+        sessionmaker = self._sessionmaker
+        if replica and self._replica_sessionmaker is not None:
+            sessionmaker = self._replica_sessionmaker
+
+        session = sessionmaker()
         try:
             yield session
         except Exception:
@@ -53,8 +217,18 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    @contextlib.asynccontextmanager
+    async def read_session(self, *keys: Any) -> AsyncIterator[AsyncSession]:
+        async with self.session(replica=not self.recently_written(*keys)) as session:
+            yield session
 
-sessionmanager = DatabaseSessionManager(settings.POSTGRES_URI_ORM, {})
+
+sessionmanager = DatabaseSessionManager(
+    settings.POSTGRES_URI_ORM,
+    engine_kwargs(),
+    replica_uri=settings.POSTGRES_URI_ORM_REPLICA,
+    read_your_writes_window=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
 
 
 async def get_db_session():
@@ -0,0 +1,73 @@
+import hashlib
+import re
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Word shingles hashed into each fingerprint.
+SHINGLE_SIZE = 3
+
+BITS = np.arange(64, dtype=np.uint64)
+
+
+def simhash(text: str, min_tokens: int) -> int | None:
+    """64-bit SimHash of the text's word 3-shingles.
+
+    Near-duplicate texts differ in only a few bits. Texts shorter than
+    `min_tokens` words return None: their fingerprints are too noisy to
+    compare.
+    """
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < max(min_tokens, SHINGLE_SIZE):
+        return None
+
+    hashes = np.fromiter(
+        (
+            int.from_bytes(
+                hashlib.blake2b(
+                    " ".join(tokens[i : i + SHINGLE_SIZE]).encode(), digest_size=8
+                ).digest(),
+                "little",
+            )
+            for i in range(len(tokens) - SHINGLE_SIZE + 1)
+        ),
+        dtype=np.uint64,
+    )
+
+    ones = ((hashes[:, None] >> BITS) & np.uint64(1)).sum(axis=0, dtype=np.int64)
+    majority = (2 * ones > len(hashes)).astype(np.uint64)
+
+    return int((majority << BITS).sum())
+
+
+class NearDuplicates[T]:
+    """Clusters items whose texts are near-duplicates, incrementally.
+
+    The first item of each cluster is its representative; later items within
+    `max_distance` bits of a representative's SimHash join its cluster.
+    """
+
+    def __init__(self, max_distance: int, min_tokens: int):
+        self._max_distance = max_distance
+        self._min_tokens = min_tokens
+        self._representatives: list[tuple[int, T]] = []
+        self._clusters: dict[str, T] = {}
+
+    def representative(self, key: str, text: str, item: T) -> T:
+        """The representative of the item's cluster (the item itself if new)."""
+        if key in self._clusters:
+            return self._clusters[key]
+
+        representative = item
+        fingerprint = simhash(text, self._min_tokens)
+        if fingerprint is not None:
+            for other, candidate in self._representatives:
+                if (fingerprint ^ other).bit_count() <= self._max_distance:
+                    representative = candidate
+                    break
+            else:
+                self._representatives.append((fingerprint, item))
+
+        self._clusters[key] = representative
+        return representative
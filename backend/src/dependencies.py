@@ -1,25 +1,32 @@
-from fastapi import Depends, HTTPException, status
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from src.supabase import supabase_client
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models.chat_sesion import ChatSession
+from src.db.pg_session import sessionmanager
+from src.tokens import AuthenticatedUser, token_verifier
 
 security = HTTPBearer()
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-):
+) -> AuthenticatedUser:
     try:
         token = credentials.credentials
 
-        user = supabase_client.auth.get_user(token)
-        if not user or not user.user:
+        user = await token_verifier.verify(token)
+        if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        return user.user
+        return user
 
     except Exception:
         raise HTTPException(
@@ -27,3 +34,41 @@ async def get_current_user(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+async def get_read_db_session(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+):
+    """Session for read-only endpoints, on the replica when one is configured.
+
+    Stays on the primary if the user, or the chat session in the path, was
+    written to recently (see `DatabaseSessionManager.mark_written`).
+    """
+    keys = [current_user.id, *request.path_params.values()]
+
+    async with sessionmanager.read_session(*keys) as session:
+        yield session
+
+
+async def find_owned_session(
+    session_id: UUID, user_id: str, read_db: AsyncSession, db: AsyncSession
+) -> tuple[ChatSession | None, AsyncSession]:
+    """The user's chat session, and the database session that found it.
+
+    Writes are only pinned to the primary in the process that made them, so a
+    chat session just created through another instance may not have reached
+    the replica yet; a miss on `read_db` is retried on the primary `db`.
+    """
+    owned_session = select(ChatSession).where(
+        ChatSession.id == session_id,
+        ChatSession.user_id == UUID(user_id),
+    )
+
+    for candidate in (read_db, db):
+        result = await candidate.execute(owned_session)
+        session = result.scalar_one_or_none()
+        if session is not None:
+            return session, candidate
+
+    return None, db
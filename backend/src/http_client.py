@@ -0,0 +1,80 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.config import settings
+
+
+class HTTPClientManager:
+    """Keeps one pooled, keep-alive `httpx.AsyncClient` per upstream host.
+
+    Scrapers and the Serper search used to open a new client (and a new
+    TCP+TLS handshake) for every request. Clients are created lazily on first
+    use of a host and live until `close()` is called on app shutdown.
+    """
+
+    def __init__(
+        self,
+        http2: bool,
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+        timeout: float,
+        connect_timeout: float,
+        host_max_connections: dict[str, int],
+        host_timeouts: dict[str, float],
+    ):
+        self._http2 = http2
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+        self._timeout = timeout
+        self._connect_timeout = connect_timeout
+        self._host_max_connections = host_max_connections
+        self._host_timeouts = host_timeouts
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _build_client(self, host: str) -> httpx.AsyncClient:
+        max_connections = self._host_max_connections.get(host, self._max_connections)
+        timeout = self._host_timeouts.get(host, self._timeout)
+
+        return httpx.AsyncClient(
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(
+                    max_connections, self._max_keepalive_connections
+                ),
+                keepalive_expiry=self._keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=self._connect_timeout),
+        )
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        host = urlsplit(url).hostname or ""
+
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = self._build_client(host)
+            self._clients[host] = client
+
+        return client
+
+    async def close(self):
+        clients = list(self._clients.values())
+        self._clients.clear()
+
+        await asyncio.gather(*[client.aclose() for client in clients])
+
+
+httpmanager = HTTPClientManager(
+    http2=settings.HTTP_HTTP2,
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    timeout=settings.HTTP_TIMEOUT,
+    connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+    host_max_connections=settings.HTTP_HOST_MAX_CONNECTIONS,
+    host_timeouts=settings.HTTP_HOST_TIMEOUTS,
+)
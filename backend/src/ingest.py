@@ -0,0 +1,295 @@
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import TypedDict
+
+import lxml.etree as etree
+from sqlalchemy.dialects.postgresql import insert
+
+from src.config import settings
+from src.db.models.crawl_checkpoint import CrawlCheckpoint
+from src.db.pg_session import sessionmanager
+from src.http_client import httpmanager
+from src.llm.summarizer import summarize
+from src.pipeline import scraper_for
+from src.scraper.article_cache import article_cache, canonicalize_url
+from src.scraper.extract import MISSING_BODY
+
+
+class FeedEntry(TypedDict):
+    link: str
+    published_at: datetime | None
+
+
+class Feed(TypedDict):
+    entries: list[FeedEntry]
+    # Child sitemaps of a sitemap index, with their own lastmod.
+    sitemaps: list[FeedEntry]
+
+
+def parse_date(value: str | None) -> datetime | None:
+    """Parse an RSS (RFC 822) or Atom/sitemap (ISO 8601) date."""
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+
+    return parsed
+
+
+def parse_feed(content: bytes) -> Feed:
+    """Read links and dates from an RSS feed, Atom feed, sitemap or sitemap index."""
+    feed: Feed = {"entries": [], "sitemaps": []}
+
+    root = etree.fromstring(content, parser=etree.XMLParser(recover=True))
+    if root is None:
+        return feed
+
+    def children(element: etree._Element, name: str) -> list[etree._Element]:
+        return [
+            child
+            for child in element
+            if isinstance(child.tag, str) and etree.QName(child).localname == name
+        ]
+
+    def text(element: etree._Element, *names: str) -> str | None:
+        for name in names:
+            for child in children(element, name):
+                if child.text and child.text.strip():
+                    return child.text.strip()
+        return None
+
+    kind = etree.QName(root).localname
+
+    if kind == "rss":
+        for channel in children(root, "channel"):
+            for item in children(channel, "item"):
+                link = text(item, "link")
+                if link:
+                    feed["entries"].append(
+                        {
+                            "link": link,
+                            "published_at": parse_date(text(item, "pubDate", "date")),
+                        }
+                    )
+
+    elif kind == "feed":
+        for entry in children(root, "entry"):
+            links = children(entry, "link")
+            link = next(
+                (
+                    element.get("href")
+                    for element in links
+                    if element.get("rel", "alternate") == "alternate"
+                ),
+                None,
+            )
+            if link:
+                feed["entries"].append(
+                    {
+                        "link": link,
+                        "published_at": parse_date(text(entry, "published", "updated")),
+                    }
+                )
+
+    elif kind in ("urlset", "sitemapindex"):
+        target = feed["entries"] if kind == "urlset" else feed["sitemaps"]
+        for url in children(root, "url" if kind == "urlset" else "sitemap"):
+            link = text(url, "loc")
+            if link:
+                target.append(
+                    {"link": link, "published_at": parse_date(text(url, "lastmod"))}
+                )
+
+    return feed
+
+
+def newest_first(entries: list[FeedEntry]) -> list[FeedEntry]:
+    """Dated entries newest first, then undated ones in feed order."""
+    oldest = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(
+        entries,
+        key=lambda entry: entry["published_at"] or oldest,
+        reverse=True,
+    )
+
+
+def is_new(entry: FeedEntry, since: datetime | None) -> bool:
+    published_at = entry["published_at"]
+    return since is None or published_at is None or published_at > since
+
+
+async def load_checkpoint(feed_url: str) -> CrawlCheckpoint | None:
+    async with sessionmanager.session() as db:
+        return await db.get(CrawlCheckpoint, feed_url)
+
+
+async def save_checkpoint(
+    feed_url: str,
+    etag: str | None,
+    last_modified: str | None,
+    last_entry_at: datetime | None,
+):
+    values = {
+        "feed_url": feed_url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "last_entry_at": last_entry_at,
+        "last_crawled_at": datetime.now(timezone.utc),
+    }
+    statement = insert(CrawlCheckpoint).values(**values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[CrawlCheckpoint.feed_url],
+        set_={key: value for key, value in values.items() if key != "feed_url"},
+    )
+
+    async with sessionmanager.session() as db:
+        await db.execute(statement)
+        await db.commit()
+
+
+def next_checkpoint(
+    entries: list[FeedEntry], failed: list[FeedEntry], since: datetime | None
+) -> datetime | None:
+    """The latest entry date the next crawl can skip, short of any failed entry.
+
+    Entries after the oldest failed one are seen again next time, but are then
+    skipped as already in the article cache.
+    """
+    failed_dates = [entry["published_at"] for entry in failed if entry["published_at"]]
+    retry_from = min(failed_dates, default=None)
+
+    dates = [
+        published_at
+        for entry in entries
+        if (published_at := entry["published_at"])
+        and (retry_from is None or published_at < retry_from)
+    ]
+    if since is not None:
+        dates.append(since)
+
+    return max(dates, default=None)
+
+
+async def ingest_entry(entry: FeedEntry, semaphore: asyncio.Semaphore) -> bool:
+    """Scrape an article into `articles` and summarize it into `article_summaries`.
+
+    Both go through the same caches the query path reads, so a later question
+    about this story finds it already scraped and summarized. Returns False if
+    the article couldn't be scraped.
+    """
+    link = entry["link"]
+    site = scraper_for(link)
+    if site is None:
+        return False
+
+    scraper, source = site
+
+    async with semaphore:
+        article = await scraper(link)
+        if article is None or article["body"] == MISSING_BODY:
+            return False
+
+        await article_cache.set(link, source, article, entry["published_at"])
+        await summarize(article)
+
+    return True
+
+
+async def crawl_feed(feed_url: str, semaphore: asyncio.Semaphore) -> int:
+    """Ingest whatever is new in one feed since its checkpoint.
+
+    The feed itself is fetched conditionally (ETag / Last-Modified). Entries
+    dated at or before the checkpoint, links already in the article cache and
+    links of sites we don't scrape are skipped. The checkpoint only moves past
+    entries that were ingested, so failed ones are retried on the next crawl.
+    Returns how many articles were ingested.
+    """
+    checkpoint = await load_checkpoint(feed_url)
+    since = checkpoint.last_entry_at if checkpoint else None
+
+    headers = {"User-Agent": "Mozilla/5.0"}
+    if checkpoint and checkpoint.etag:
+        headers["If-None-Match"] = checkpoint.etag
+    if checkpoint and checkpoint.last_modified:
+        headers["If-Modified-Since"] = checkpoint.last_modified
+
+    client = httpmanager.client(feed_url)
+    response = await client.get(feed_url, headers=headers)
+    if response.status_code == 304:
+        return 0
+    response.raise_for_status()
+
+    feed = parse_feed(response.content)
+    entries = feed["entries"]
+
+    # For a sitemap index, read the child sitemaps that changed since the
+    # checkpoint (the most recent few when their dates are unknown).
+    sitemaps = [sitemap for sitemap in feed["sitemaps"] if is_new(sitemap, since)]
+    for sitemap in newest_first(sitemaps)[: settings.CRAWL_MAX_CHILD_SITEMAPS]:
+        child = await httpmanager.client(sitemap["link"]).get(
+            sitemap["link"], headers={"User-Agent": "Mozilla/5.0"}
+        )
+        if child.is_success:
+            entries.extend(parse_feed(child.content)["entries"])
+
+    entries = [entry for entry in entries if is_new(entry, since)]
+    entries = newest_first(entries)[: settings.CRAWL_MAX_ARTICLES_PER_FEED]
+
+    known = await article_cache.get_many([entry["link"] for entry in entries])
+    pending = [
+        entry
+        for entry in entries
+        if canonicalize_url(entry["link"]) not in known
+        and scraper_for(entry["link"]) is not None
+    ]
+
+    results = await asyncio.gather(
+        *(ingest_entry(entry, semaphore) for entry in pending),
+        return_exceptions=True,
+    )
+
+    failed: list[FeedEntry] = []
+    for entry, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            print(f"Error ingesting {entry['link']}: {result!r}")
+        if result is not True:
+            failed.append(entry)
+
+    # Without validators the next crawl refetches the feed to retry failures.
+    await save_checkpoint(
+        feed_url,
+        None if failed else response.headers.get("ETag"),
+        None if failed else response.headers.get("Last-Modified"),
+        next_checkpoint(entries, failed, since),
+    )
+
+    return sum(result is True for result in results)
+
+
+async def crawl_once() -> int:
+    semaphore = asyncio.Semaphore(settings.CRAWL_CONCURRENCY)
+
+    results = await asyncio.gather(
+        *(crawl_feed(feed_url, semaphore) for feed_url in settings.CRAWL_FEEDS),
+        return_exceptions=True,
+    )
+
+    ingested = 0
+    for feed_url, result in zip(settings.CRAWL_FEEDS, results):
+        if isinstance(result, BaseException):
+            print(f"Error crawling {feed_url}: {result!r}")
+        else:
+            ingested += result
+
+    return ingested
@@ -0,0 +1,155 @@
+from datetime import timedelta
+from uuid import UUID
+
+from sqlalchemy import Row, and_, exists, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import func
+
+from src.config import settings
+from src.db.models.chat_job import ChatJob
+from src.db.pg_session import sessionmanager
+
+
+async def enqueue_chat_job(db: AsyncSession, session_id: UUID, user_query: str) -> UUID:
+    job = ChatJob(
+        session_id=session_id,
+        user_query=user_query,
+        status="queued",
+        attempts=0,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    return job.id
+
+
+async def claim_chat_job() -> Row | None:
+    """Lock the next runnable job for this worker with `FOR UPDATE SKIP LOCKED`.
+
+    Runnable means queued and due, or running with a lease older than
+    JOB_LEASE_SECONDS (its worker died mid-job) and attempts left. Claiming
+    bumps `attempts`.
+
+    A session runs one flow at a time, in the order its queries came in: a
+    job waits while an earlier job of its session is still queued or running.
+    MessageBuffer relies on this, since it stamps rows before inserting them.
+    """
+    lease_expired = func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+    earlier = aliased(ChatJob)
+    earlier_pending = exists().where(
+        earlier.session_id == ChatJob.session_id,
+        earlier.status.in_(("queued", "running")),
+        tuple_(earlier.created_at, earlier.id) < tuple_(ChatJob.created_at, ChatJob.id),
+    )
+
+    next_job = (
+        select(ChatJob.id)
+        .where(
+            or_(
+                and_(ChatJob.status == "queued", ChatJob.run_after <= func.now()),
+                and_(
+                    ChatJob.status == "running",
+                    ChatJob.locked_at < lease_expired,
+                    ChatJob.attempts < ChatJob.max_attempts,
+                ),
+            ),
+            ~earlier_pending,
+        )
+        .order_by(ChatJob.run_after)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+    statement = (
+        update(ChatJob)
+        .where(ChatJob.id == next_job)
+        .values(
+            status="running",
+            attempts=ChatJob.attempts + 1,
+            locked_at=func.now(),
+        )
+        .returning(
+            ChatJob.id,
+            ChatJob.session_id,
+            ChatJob.user_query,
+            ChatJob.attempts,
+            ChatJob.max_attempts,
+        )
+    )
+
+    async with sessionmanager.session() as db:
+        result = await db.execute(statement)
+        job = result.one_or_none()
+        await db.commit()
+
+    return job
+
+
+async def fail_expired_chat_jobs() -> list[Row]:
+    """Mark failed the jobs whose worker died on their final attempt.
+
+    Returns them so the worker can tell their sessions.
+    """
+    lease_expired = func.now() - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+
+    statement = (
+        update(ChatJob)
+        .where(
+            ChatJob.status == "running",
+            ChatJob.locked_at < lease_expired,
+            ChatJob.attempts >= ChatJob.max_attempts,
+        )
+        .values(
+            status="failed",
+            locked_at=None,
+            last_error="Lease expired on the final attempt",
+        )
+        .returning(ChatJob.id, ChatJob.session_id)
+    )
+
+    async with sessionmanager.session() as db:
+        result = await db.execute(statement)
+        jobs = list(result.all())
+        await db.commit()
+
+    return jobs
+
+
+async def complete_chat_job(job_id: UUID):
+    async with sessionmanager.session() as db:
+        await db.execute(
+            update(ChatJob)
+            .where(ChatJob.id == job_id)
+            .values(status="succeeded", locked_at=None)
+        )
+        await db.commit()
+
+
+async def fail_chat_job(job: Row, error: str) -> bool:
+    """Record a failed attempt. Returns True when the job will be retried."""
+    retry = job.attempts < job.max_attempts
+    backoff = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job.attempts - 1)
+
+    values = (
+        {
+            "status": "queued",
+            "run_after": func.now() + timedelta(seconds=backoff),
+        }
+        if retry
+        else {"status": "failed"}
+    )
+
+    async with sessionmanager.session() as db:
+        await db.execute(
+            update(ChatJob)
+            .where(ChatJob.id == job.id)
+            .values(locked_at=None, last_error=error, **values)
+        )
+        await db.commit()
+
+    return retry
@@ -1,5 +1,7 @@
 from openai import AsyncOpenAI
+from openai.types.chat import ChatCompletionMessageParam
 from src.config import settings
+from collections.abc import AsyncIterator
 from typing import List, Dict
 
 ANSWER_SYSTEM_PROMPT = """You are a news analysis assistant. Your role is to provide comprehensive, factual answers based on multiple news sources.
@@ -76,40 +78,68 @@ Critical rules:
 client = AsyncOpenAI(api_key=settings.OPENAI_KEY)
 
 
-async def generate_answer(
+def build_messages(
     user_query: str,
     summaries_with_sources: List[Dict[str, str]],
-    mrkdwn: bool = True,
-) -> str | None:
-    try:
-        summaries_text = "\n\n".join(
-            [
-                f"Source: {item['source']}\nLink: {item['link']}\nSummary: {item['summary']}"
-                for item in summaries_with_sources
-            ]
-        )
+    mrkdwn: bool,
+) -> List[ChatCompletionMessageParam]:
+    summaries = []
+    for item in summaries_with_sources:
+        text = f"Source: {item['source']}\nLink: {item['link']}\n"
+        if item.get("also_reported_by"):
+            text += f"Also reported by: {item['also_reported_by']}\n"
+        summaries.append(text + f"Summary: {item['summary']}")
+
+    summaries_text = "\n\n".join(summaries)
 
-        user_message = f"""User Query: {user_query}
+    user_message = f"""User Query: {user_query}
 
 News Summaries:
 {summaries_text}"""
 
-        system_prompt = (
-            ANSWER_SYSTEM_PROMPT if mrkdwn else ANSWER_SYSTEM_PROMPT_NO_MARKDOWN
-        )
+    system_prompt = ANSWER_SYSTEM_PROMPT if mrkdwn else ANSWER_SYSTEM_PROMPT_NO_MARKDOWN
+
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_message},
+    ]
+
 
-        response = await client.chat.completions.create(
+class AnswerInterrupted(Exception):
+    """The answer stream failed after part of the answer had been yielded."""
+
+
+async def stream_answer(
+    user_query: str,
+    summaries_with_sources: List[Dict[str, str]],
+    mrkdwn: bool = True,
+) -> AsyncIterator[str]:
+    """Yield the answer as text deltas as soon as the model produces them.
+
+    An error before the first delta ends the stream without raising, and
+    callers treat the empty stream as a failed generation. An error after it
+    raises AnswerInterrupted, so a partial answer is never passed off as
+    complete.
+    """
+    answered = False
+    try:
+        stream = await client.chat.completions.create(
             model="gpt-4.1",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message},
-            ],
+            messages=build_messages(user_query, summaries_with_sources, mrkdwn),
             temperature=0.3,
+            stream=True,
         )
 
-        answer = response.choices[0].message.content
-        return answer if answer else None
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+
+            delta = chunk.choices[0].delta.content
+            if delta:
+                answered = True
+                yield delta
 
     except Exception as e:
-        print(f"Error generating answer: {e}")
-        return None
+        print(f"Error streaming answer: {e}")
+        if answered:
+            raise AnswerInterrupted(str(e)) from e
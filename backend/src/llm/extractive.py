@@ -0,0 +1,93 @@
+import numpy as np
+
+from src.llm.token_budget import split_sentences
+from src.ranking import tokenize
+
+# PageRank damping: the share of a sentence's score that flows from similar
+# sentences rather than from the heading/query bias.
+DAMPING = 0.85
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-6
+
+# Weight of each heading or query word a sentence contains in the bias, on top
+# of the base weight every sentence gets. The lede gets LEDE_BIAS extra.
+FOCUS_BIAS = 1.0
+LEDE_BIAS = 2.0
+
+
+def textrank(sentences: list[str], focus: set[str]) -> np.ndarray:
+    """Query-biased TextRank score of every sentence.
+
+    Sentences are TF-IDF vectors and edges their cosine similarities. The
+    random walk restarts according to how many `focus` words each sentence
+    contains, so sentences central to the article *and* close to the heading
+    and query rank highest.
+    """
+    tokens = [tokenize(sentence) for sentence in sentences]
+    terms = sorted(set().union(*tokens))
+    vocabulary = {term: column for column, term in enumerate(terms)}
+
+    tf = np.zeros((len(sentences), len(vocabulary)))
+    for row, sentence_terms in enumerate(tokens):
+        for term in sentence_terms:
+            tf[row, vocabulary[term]] += 1
+
+    idf = np.log1p(len(sentences) / (1 + np.count_nonzero(tf, axis=0)))
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+
+    matches = [len(focus.intersection(sentence_terms)) for sentence_terms in tokens]
+    bias = 1.0 + FOCUS_BIAS * np.array(matches, dtype=float)
+    bias[0] += LEDE_BIAS
+    bias /= bias.sum()
+
+    # Sentences sharing no words with any other restart the walk instead.
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(
+        similarity, out_weight, out=np.zeros_like(similarity), where=out_weight > 0
+    )
+    dangling = out_weight[:, 0] == 0
+
+    scores = bias
+    for _ in range(MAX_ITERATIONS):
+        walked = scores @ transition + scores[dangling].sum() * bias
+        updated = (1 - DAMPING) * bias + DAMPING * walked
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+
+    return scores
+
+
+def extractive_summary(
+    heading: str,
+    body: str,
+    max_sentences: int,
+    query: str | None = None,
+) -> str | None:
+    """Summarize an article locally, as bullet points of its key sentences.
+
+    The `max_sentences` best sentences by query-biased TextRank are listed in
+    article order; shorter articles are listed whole. Returns None for a body
+    without any sentences.
+    """
+    sentences = [sentence for _, sentence in split_sentences(body)]
+    if not sentences:
+        return None
+
+    if len(sentences) <= max_sentences:
+        chosen = range(len(sentences))
+    else:
+        focus = set(tokenize(heading))
+        if query:
+            focus.update(tokenize(query))
+
+        scores = textrank(sentences, focus)
+        chosen = sorted(np.argsort(-scores, kind="stable")[:max_sentences])
+
+    return "\n".join(f"- {sentences[index]}" for index in chosen)
@@ -1,7 +1,18 @@
+import hashlib
+
 from dotenv import load_dotenv
 from pydantic import BaseModel
 from openai import AsyncOpenAI
 from src.config import settings
+from src.llm.intent_cache import intent_cache, verdict_key
+from src.llm.intent_classifier import (
+    CHITCHAT_MESSAGE,
+    load_intent_model,
+    normalize_query,
+    rule_verdict,
+    search_plan,
+)
+from src.scraper.types import TimeWindow
 
 load_dotenv()
 
@@ -10,11 +21,16 @@ class IntentOutput(BaseModel):
     is_valid: bool
     reason: str
     clarification_message: str
+    # Search plan for valid queries: a rewritten search engine query, the
+    # people/places/organizations it is about, and how far back to look.
+    search_query: str
+    entities: list[str]
+    time_window: TimeWindow
 
 
-VALIDATION_SYSTEM_PROMPT = """You are a query classifier for a news aggregation system. Your ONLY job is to classify whether a query is suitable for searching news sources.
+VALIDATION_SYSTEM_PROMPT = """You are a query classifier for a news aggregation system. Your job is to classify whether a query is suitable for searching news sources and, if it is, to plan the news search.
 
-IMPORTANT: You are NOT answering questions. You are ONLY classifying them as valid or invalid for news search.
+IMPORTANT: You are NOT answering questions. You are ONLY classifying them as valid or invalid for news search and planning the search for valid ones.
 
 VALID queries ask about:
 - Current events, news, or recent developments
@@ -47,11 +63,14 @@ Examples of INVALID queries:
 "Hello" → greeting
 "Tell me a joke" → not news-related
 
-Your response MUST be a JSON object with exactly these three fields:
+Your response MUST be a JSON object with exactly these six fields:
 {
     "is_valid": boolean,
     "reason": "Brief internal explanation for your decision",
-    "clarification_message": "User-facing message (empty string if valid)"
+    "clarification_message": "User-facing message (empty string if valid)",
+    "search_query": "Optimized news search engine query (empty string if invalid)",
+    "entities": ["Key people, places, organizations or events"],
+    "time_window": "any" | "day" | "week" | "month" | "year"
 }
 
 Guidelines for each field:
@@ -73,87 +92,228 @@ Guidelines for each field:
 - Use empty string ("") if query is valid
 - Do NOT provide any information related to their question
 
+**search_query** (only when valid):
+- A short keyword query (2-8 words) that a news search engine will match well
+- Fix typos and drop filler such as "what's happening with", "tell me about", "latest news on"
+- Translate Nepali or transliterated words to English (e.g. "bhukampa" → "earthquake", "chunab" → "election")
+- Do NOT add site names, "Nepal" (the search is already limited to Nepali outlets) or search operators
+- Use empty string ("") if query is invalid
+
+**entities**:
+- The key named people, places, organizations or events the query is about, spelled as English news outlets would
+- Use an empty list ([]) if there are none or the query is invalid
+
+**time_window**:
+- How far back relevant news can be: "day", "week", "month" or "year"
+- "day" for "today", "right now" or breaking events; "week" for "this week", "recent", "latest" or a situation that is still unfolding
+- "any" when the query names no period and is not about an unfolding situation, or asks about a past event or its background
+- Use "any" if the query is invalid
+
 Example outputs:
 
 Query: "landslide situation in nepal"
 {
     "is_valid": true,
     "reason": "Query asks about current events that can be found in news sources",
-    "clarification_message": ""
+    "clarification_message": "",
+    "search_query": "landslide",
+    "entities": ["Nepal"],
+    "time_window": "week"
+}
+
+Query: "whats hapening with melamchi khanepani this week"
+{
+    "is_valid": true,
+    "reason": "Query asks about recent developments of a newsworthy project",
+    "clarification_message": "",
+    "search_query": "Melamchi drinking water project",
+    "entities": ["Melamchi Water Supply Project"],
+    "time_window": "week"
+}
+
+Query: "aaja ko bhukampa"
+{
+    "is_valid": true,
+    "reason": "Query asks about today's earthquake, a newsworthy event",
+    "clarification_message": "",
+    "search_query": "earthquake today",
+    "entities": [],
+    "time_window": "day"
 }
 
 Query: "What is 25 + 37?"
 {
     "is_valid": false,
     "reason": "This is a math calculation, not a news-related query",
-    "clarification_message": "This is a math problem, not a news query. I can only search for news and current events."
+    "clarification_message": "This is a math problem, not a news query. I can only search for news and current events.",
+    "search_query": "",
+    "entities": [],
+    "time_window": "any"
 }
 
 Query: "What is the capital of France?"
 {
     "is_valid": false,
     "reason": "This is a general knowledge question, not about current events or news",
-    "clarification_message": "This is a general knowledge question, not a news query. Try asking about recent events or news topics."
+    "clarification_message": "This is a general knowledge question, not a news query. Try asking about recent events or news topics.",
+    "search_query": "",
+    "entities": [],
+    "time_window": "any"
 }
 
 Query: "Hello, how are you?"
 {
     "is_valid": false,
     "reason": "This is a greeting, not a news-related query",
-    "clarification_message": "I can only help with news and current events. Please ask about a specific news topic or event."
+    "clarification_message": "I can only help with news and current events. Please ask about a specific news topic or event.",
+    "search_query": "",
+    "entities": [],
+    "time_window": "any"
 }
 
 Query: "Did something happen?"
 {
     "is_valid": false,
     "reason": "Query is too vague to search for relevant news",
-    "clarification_message": "Your query is too vague. Please be more specific about what event or news topic you're asking about."
+    "clarification_message": "Your query is too vague. Please be more specific about what event or news topic you're asking about.",
+    "search_query": "",
+    "entities": [],
+    "time_window": "any"
 }
 
 Query: "How do I bake a cake?"
 {
     "is_valid": false,
     "reason": "This is a how-to question, not about news or current events",
-    "clarification_message": "This is a how-to question, not a news query. I can only search for news and current events."
+    "clarification_message": "This is a how-to question, not a news query. I can only search for news and current events.",
+    "search_query": "",
+    "entities": [],
+    "time_window": "any"
 }
 
 Query: "earthquake in kathmandu"
 {
     "is_valid": true,
     "reason": "Query asks about a newsworthy event that can be found in news sources",
-    "clarification_message": ""
+    "clarification_message": "",
+    "search_query": "earthquake Kathmandu",
+    "entities": ["Kathmandu"],
+    "time_window": "any"
 }
 
 Query: "Will it rain tomorrow?"
 {
     "is_valid": false,
     "reason": "This is a weather forecast request, not about news or past events",
-    "clarification_message": "This is a weather forecast question, not a news query. I can only search for news about past or current events."
+    "clarification_message": "This is a weather forecast question, not a news query. I can only search for news about past or current events.",
+    "search_query": "",
+    "entities": [],
+    "time_window": "any"
 }
 """
 
 
+INTENT_MODEL = "gpt-4.1"
+
+# Derived from the prompt text, like SUMMARIZER_PROMPT_VERSION.
+INTENT_PROMPT_VERSION = hashlib.sha256(
+    VALIDATION_SYSTEM_PROMPT.encode("utf-8")
+).hexdigest()[:12]
+
 client = AsyncOpenAI(api_key=settings.OPENAI_KEY)
 
+intent_model = load_intent_model(settings.INTENT_MODEL_PATH)
 
-async def validate_news_query(user_query: str) -> IntentOutput:
-    try:
-        user_message = f'Classify this query: Is it suitable for news search?\n\nQuery: "{user_query}"'
-
-        response = await client.responses.parse(
-            model="gpt-4.1",
-            input=[
-                {"role": "system", "content": VALIDATION_SYSTEM_PROMPT},
-                {"role": "user", "content": user_message},
-            ],
-            text_format=IntentOutput,
+
+def invalid_intent(reason: str, clarification_message: str) -> IntentOutput:
+    return IntentOutput(
+        is_valid=False,
+        reason=reason,
+        clarification_message=clarification_message,
+        search_query="",
+        entities=[],
+        time_window="any",
+    )
+
+
+def local_intent(query: str) -> IntentOutput | None:
+    """The local model's verdict on a normalized query, if it is confident."""
+    if intent_model is None:
+        return None
+
+    probability = intent_model.probability(query)
+
+    if probability >= settings.INTENT_LOCAL_VALID_CONFIDENCE:
+        search_query, time_window = search_plan(query)
+        return IntentOutput(
+            is_valid=True,
+            reason=f"Local classifier: news query with p={probability:.3f}",
+            clarification_message="",
+            search_query=search_query,
+            entities=[],
+            time_window=time_window,
+        )
+
+    if probability <= 1 - settings.INTENT_LOCAL_INVALID_CONFIDENCE:
+        return invalid_intent(
+            f"Local classifier: not a news query with p={1 - probability:.3f}",
+            CHITCHAT_MESSAGE,
         )
 
-        return response.output_parsed
+    return None
+
+
+async def classify_with_llm(user_query: str) -> IntentOutput:
+    user_message = (
+        f'Classify this query: Is it suitable for news search?\n\nQuery: "{user_query}"'
+    )
+
+    response = await client.responses.parse(
+        model=INTENT_MODEL,
+        input=[
+            {"role": "system", "content": VALIDATION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+        ],
+        text_format=IntentOutput,
+    )
+
+    if response.output_parsed is None:
+        raise ValueError("Intent response could not be parsed")
+
+    return response.output_parsed
 
+
+async def validate_news_query(user_query: str) -> IntentOutput:
+    """Classify a query with rules, cached verdicts, the local model, then the LLM."""
+    query = normalize_query(user_query)
+
+    clarification_message = rule_verdict(query)
+    if clarification_message is not None:
+        return invalid_intent("Matched a local rule", clarification_message)
+
+    key = verdict_key(query, INTENT_PROMPT_VERSION, INTENT_MODEL)
+    cached = await intent_cache.get(key)
+    if cached is not None:
+        return IntentOutput.model_validate_json(cached)
+
+    verdict = local_intent(query)
+    if verdict is not None:
+        return verdict
+
+    try:
+        verdict = await classify_with_llm(user_query)
     except Exception as e:
-        return IntentOutput(
-            is_valid=False,
-            clarification_message="Something went wrong while processing your query. Please try again.",
-            reason=str(e),
+        return invalid_intent(
+            str(e),
+            "Something went wrong while processing your query. Please try again.",
         )
+
+    await intent_cache.set(
+        key,
+        query,
+        verdict.is_valid,
+        verdict.model_dump_json(),
+        INTENT_PROMPT_VERSION,
+        INTENT_MODEL,
+    )
+    return verdict
@@ -0,0 +1,77 @@
+import hashlib
+import json
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.cache import LRUCache
+from src.config import settings
+from src.db.models.intent_verdict import IntentVerdict
+from src.db.pg_session import sessionmanager
+
+
+def verdict_key(query: str, prompt_version: str, model: str) -> str:
+    payload = json.dumps([query, prompt_version, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IntentCache:
+    """LLM intent verdicts by normalized query: an LRU in front of `intent_verdicts`.
+
+    Verdicts are stored as IntentOutput JSON. Like summaries, the key covers
+    the prompt version and model, so entries never expire.
+    """
+
+    def __init__(self, maxsize: int):
+        self._lru: LRUCache[str, str] = LRUCache(maxsize)
+
+    async def get(self, key: str) -> str | None:
+        verdict = self._lru.get(key)
+        if verdict is not None:
+            return verdict
+
+        try:
+            async with sessionmanager.session(replica=True) as db:
+                row = await db.get(IntentVerdict, key)
+        except Exception as e:
+            print(f"Error reading intent cache: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        self._lru.set(key, row.verdict)
+        return row.verdict
+
+    async def set(
+        self,
+        key: str,
+        query: str,
+        is_valid: bool,
+        verdict: str,
+        prompt_version: str,
+        model: str,
+    ):
+        self._lru.set(key, verdict)
+
+        statement = (
+            insert(IntentVerdict)
+            .values(
+                query_hash=key,
+                query=query,
+                model=model,
+                prompt_version=prompt_version,
+                is_valid=is_valid,
+                verdict=verdict,
+            )
+            .on_conflict_do_nothing(index_elements=[IntentVerdict.query_hash])
+        )
+
+        try:
+            async with sessionmanager.session() as db:
+                await db.execute(statement)
+                await db.commit()
+        except Exception as e:
+            print(f"Error writing intent cache: {e}")
+
+
+intent_cache = IntentCache(maxsize=settings.INTENT_CACHE_MAXSIZE)
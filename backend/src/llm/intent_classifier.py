@@ -0,0 +1,173 @@
+import math
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+from src.scraper.types import TimeWindow
+
+WORD_PATTERN = re.compile(r"\w+")
+SPACE_PATTERN = re.compile(r"\s+")
+
+# Obvious non-news queries, matched against the whole normalized query.
+ARITHMETIC_PATTERN = re.compile(
+    r"(what'?s |what is |whats |calculate |solve )?"
+    r"[\d\s.,()]*\d[\d\s.,()]*([-+*/x×÷^%=][\d\s.,()]*)+"
+)
+CHITCHAT_PATTERN = re.compile(
+    r"(hi+|hey+|hello+|namaste|namaskar|yo|sup|ok(ay)?|thanks?( you)?|thank u|bye"
+    r"|good (morning|afternoon|evening|night)|how are (you|u)|who are (you|u)"
+    r"|what can you do|tell me a joke|test(ing)?)( there)?[\s!.?]*"
+)
+
+CHITCHAT_MESSAGE = "I can only help with news and current events. Please ask about a specific news topic or event."
+ARITHMETIC_MESSAGE = "This is a math problem, not a news query. I can only search for news and current events."
+VAGUE_MESSAGE = "Your query is too vague. Please be more specific about what event or news topic you're asking about."
+
+# Leading filler dropped from the search query of a locally accepted query.
+FILLER_PATTERN = re.compile(
+    r"^(what'?s|what is|whats) (happening|going on) (with|in|at|to|on)\s+"
+    r"|^what happened (in|to|at|with|on)\s+"
+    r"|^(tell me|give me|show me) (about|the)?\s*"
+    r"|^(any |the )?(latest |recent )?(news|updates?) (on|about|of|from|in)\s+"
+    r"|^(latest|update) on\s+"
+)
+
+TIME_WINDOW_PATTERNS: list[tuple[TimeWindow, re.Pattern[str]]] = [
+    ("day", re.compile(r"\b(today|tonight|right now|this morning|breaking|aaja)\b")),
+    (
+        "week",
+        re.compile(
+            r"\b(this week|recent(ly)?|latest|current(ly)?|ongoing|situation)\b"
+        ),
+    ),
+    ("month", re.compile(r"\bthis month\b")),
+    ("year", re.compile(r"\bthis year\b")),
+]
+
+# 2^18 weights: few enough to load instantly, enough to keep collisions rare.
+FEATURE_BITS = 18
+FEATURE_MASK = (1 << FEATURE_BITS) - 1
+
+
+def normalize_query(query: str) -> str:
+    """Casefolded, NFKC-normalized query with whitespace and end punctuation tidied."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return SPACE_PATTERN.sub(" ", query).strip(" \"'?!.")
+
+
+def rule_verdict(query: str) -> str | None:
+    """The clarification message for an obviously invalid normalized query."""
+    if not WORD_PATTERN.search(query):
+        return VAGUE_MESSAGE
+    if ARITHMETIC_PATTERN.fullmatch(query):
+        return ARITHMETIC_MESSAGE
+    if CHITCHAT_PATTERN.fullmatch(query):
+        return CHITCHAT_MESSAGE
+    return None
+
+
+def search_plan(query: str) -> tuple[str, TimeWindow]:
+    """Search query and time window for a normalized query, without the LLM."""
+    time_window: TimeWindow = "any"
+    for window, pattern in TIME_WINDOW_PATTERNS:
+        if pattern.search(query):
+            time_window = window
+            break
+
+    return FILLER_PATTERN.sub("", query) or query, time_window
+
+
+def hashed_features(query: str) -> np.ndarray:
+    """Hashes of the query's words, word bigrams and character trigrams."""
+    words = WORD_PATTERN.findall(query)
+    grams = [f"w {word}" for word in words]
+    grams += [f"b {first} {second}" for first, second in zip(words, words[1:])]
+    padded = f" {' '.join(words)} "
+    grams += [f"c {padded[i : i + 3]}" for i in range(len(padded) - 2)]
+
+    return np.unique(
+        np.fromiter(
+            (zlib.crc32(gram.encode("utf-8")) & FEATURE_MASK for gram in grams),
+            dtype=np.int64,
+            count=len(grams),
+        )
+    )
+
+
+def sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1 / (1 + math.exp(-z))
+    return math.exp(z) / (1 + math.exp(z))
+
+
+class IntentModel:
+    """Logistic regression over hashed word and character n-grams.
+
+    A query is the set of its n-gram hashes, scaled to unit length, so scoring
+    it is a sum over a few dozen weights. Trained on the LLM's logged verdicts
+    by train_intent.py.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float):
+        self._weights = weights
+        self._bias = bias
+
+    def _logit(self, indices: np.ndarray) -> float:
+        if not len(indices):
+            return self._bias
+
+        total = float(self._weights[indices].sum())
+        return total / math.sqrt(len(indices)) + self._bias
+
+    def probability(self, query: str) -> float:
+        """Probability that a normalized query is a valid news query."""
+        return sigmoid(self._logit(hashed_features(query)))
+
+    @classmethod
+    def train(
+        cls,
+        examples: list[tuple[str, bool]],
+        epochs: int = 20,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> "IntentModel":
+        """Fit on (normalized query, is_valid) pairs with plain SGD."""
+        model = cls(np.zeros(1 << FEATURE_BITS), 0.0)
+        rows = [(hashed_features(query), float(label)) for query, label in examples]
+        rng = np.random.default_rng(seed)
+
+        for _ in range(epochs):
+            for index in rng.permutation(len(rows)):
+                indices, label = rows[index]
+                error = sigmoid(model._logit(indices)) - label
+                if len(indices):
+                    weights = model._weights[indices]
+                    gradient = error / math.sqrt(len(indices)) + l2 * weights
+                    model._weights[indices] = weights - learning_rate * gradient
+                model._bias -= learning_rate * error
+
+        return model
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path, weights=self._weights.astype(np.float32), bias=self._bias
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "IntentModel":
+        with np.load(path) as data:
+            return cls(data["weights"].astype(np.float64), float(data["bias"]))
+
+
+def load_intent_model(path: str) -> IntentModel | None:
+    if not path:
+        return None
+
+    try:
+        return IntentModel.load(path)
+    except (OSError, KeyError, ValueError) as e:
+        print(f"Intent model not loaded from {path}: {e}")
+        return None
@@ -1,5 +1,10 @@
+import hashlib
+
 from openai import AsyncOpenAI
 from src.config import settings
+from src.llm.extractive import extractive_summary
+from src.llm.summary_cache import summary_cache, summary_key
+from src.llm.token_budget import compress_body
 from src.scraper.types import ScrapedArticle
 
 SUMMARIZER_SYSTEM_PROMPT = """You are a professional news summarizer specializing in extracting key information from news articles.
@@ -28,18 +33,56 @@ Important guidelines:
 Output format:
 Present your summary in a structured format with clear sections or bullet points that make it easy to understand all the key information from the article."""
 
+SUMMARIZER_MODEL = "gpt-4.1"
+
+# Derived from the prompt text, so editing SUMMARIZER_SYSTEM_PROMPT invalidates
+# every cached summary without a manual version bump.
+SUMMARIZER_PROMPT_VERSION = hashlib.sha256(
+    SUMMARIZER_SYSTEM_PROMPT.encode("utf-8")
+).hexdigest()[:12]
+
 client = AsyncOpenAI(api_key=settings.OPENAI_KEY)
 
 
-async def summarize(article: ScrapedArticle) -> str | None:
+async def summarize(
+    article: ScrapedArticle, query: str | None = None, degraded: bool = False
+) -> str | None:
+    """Summarize an article; the query only steers extractive summaries."""
+    heading = article["heading"]
+    if (
+        settings.SUMMARIZER_MODE == "extractive"
+        or len(article["body"].split()) <= settings.SUMMARIZER_FAST_PATH_MAX_WORDS
+    ):
+        return extractive_summary(
+            heading,
+            article["body"],
+            settings.SUMMARIZER_EXTRACTIVE_SENTENCES,
+            query,
+        )
+
+    budget = settings.SUMMARIZER_INPUT_TOKEN_BUDGETS.get(
+        SUMMARIZER_MODEL, settings.SUMMARIZER_INPUT_TOKEN_BUDGET
+    )
+    body = compress_body(heading, article["body"], SUMMARIZER_MODEL, budget)
+
+    key = summary_key(heading, body, SUMMARIZER_PROMPT_VERSION, SUMMARIZER_MODEL)
+    cached = await summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if degraded:
+        return extractive_summary(
+            heading, body, settings.SUMMARIZER_EXTRACTIVE_SENTENCES, query
+        )
+
     try:
-        user_message = f"""Title: {article["heading"]}
+        user_message = f"""Title: {heading}
 
 Article Content:
-{article["body"]}"""
+{body}"""
 
         response = await client.chat.completions.create(
-            model="gpt-4.1",
+            model=SUMMARIZER_MODEL,
             messages=[
                 {"role": "system", "content": SUMMARIZER_SYSTEM_PROMPT},
                 {"role": "user", "content": user_message},
@@ -48,7 +91,13 @@ Article Content:
         )
 
         summary = response.choices[0].message.content
-        return summary if summary else None
+        if not summary:
+            return None
+
+        await summary_cache.set(
+            key, summary, SUMMARIZER_PROMPT_VERSION, SUMMARIZER_MODEL
+        )
+        return summary
 
     except Exception as e:
         print(f"Error summarizing article: {e}")
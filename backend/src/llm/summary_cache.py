@@ -0,0 +1,67 @@
+import hashlib
+import json
+
+from sqlalchemy.dialects.postgresql import insert
+
+from src.cache import LRUCache
+from src.config import settings
+from src.db.models.article_summary import ArticleSummary
+from src.db.pg_session import sessionmanager
+
+
+def summary_key(heading: str, body: str, prompt_version: str, model: str) -> str:
+    payload = json.dumps([heading, body, prompt_version, model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """Content-addressed summaries: an in-process LRU in front of `article_summaries`.
+
+    The key already covers the prompt version and model, so entries never
+    expire; changing either simply stops old rows from being looked up.
+    """
+
+    def __init__(self, maxsize: int):
+        self._lru: LRUCache[str, str] = LRUCache(maxsize)
+
+    async def get(self, key: str) -> str | None:
+        summary = self._lru.get(key)
+        if summary is not None:
+            return summary
+
+        try:
+            async with sessionmanager.session() as db:
+                row = await db.get(ArticleSummary, key)
+        except Exception as e:
+            print(f"Error reading summary cache: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        self._lru.set(key, row.summary)
+        return row.summary
+
+    async def set(self, key: str, summary: str, prompt_version: str, model: str):
+        self._lru.set(key, summary)
+
+        statement = (
+            insert(ArticleSummary)
+            .values(
+                content_hash=key,
+                model=model,
+                prompt_version=prompt_version,
+                summary=summary,
+            )
+            .on_conflict_do_nothing(index_elements=[ArticleSummary.content_hash])
+        )
+
+        try:
+            async with sessionmanager.session() as db:
+                await db.execute(statement)
+                await db.commit()
+        except Exception as e:
+            print(f"Error writing summary cache: {e}")
+
+
+summary_cache = SummaryCache(maxsize=settings.SUMMARY_CACHE_MAXSIZE)
@@ -0,0 +1,116 @@
+import math
+import re
+from collections.abc import Callable
+from functools import cache
+
+from src.ranking import tokenize
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+PIECE_PATTERN = re.compile(r"\w+|[^\w\s]")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])[\"'”’)]*\s+(?=[\"'“‘(]?[A-Z0-9])")
+NUMBER_PATTERN = re.compile(r"\d")
+QUOTE_PATTERN = re.compile(r"[\"“”]")
+
+# Sentences of the first paragraph always kept, however the rest is cut.
+LEDE_SENTENCES = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate BPE count: a token per punctuation mark and six letters."""
+    pieces = PIECE_PATTERN.findall(text)
+    return sum(max(1, math.ceil(len(piece) / 6)) for piece in pieces)
+
+
+@cache
+def token_counter(model: str) -> Callable[[str], int]:
+    """The model's tiktoken encoder when it can be loaded, else the estimate."""
+    if tiktoken is not None:
+        try:
+            try:
+                encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                encoding = tiktoken.get_encoding("o200k_base")
+            return lambda text: len(encoding.encode(text, disallowed_special=()))
+        except Exception as e:
+            print(f"Falling back to estimated token counts for {model}: {e!r}")
+
+    return estimate_tokens
+
+
+def count_tokens(text: str, model: str) -> int:
+    return token_counter(model)(text)
+
+
+def split_sentences(body: str) -> list[tuple[int, str]]:
+    """The body's sentences, each with the index of its paragraph."""
+    sentences: list[tuple[int, str]] = []
+    for index, paragraph in enumerate(body.split("\n\n")):
+        sentences.extend(
+            (index, sentence.strip())
+            for sentence in SENTENCE_PATTERN.split(paragraph)
+            if sentence.strip()
+        )
+
+    return sentences
+
+
+def compress_body(
+    heading: str,
+    body: str,
+    model: str,
+    budget: int,
+    query: str | None = None,
+) -> str:
+    """Cut an article body down to at most `budget` tokens, extractively.
+
+    Bodies within budget are returned unchanged. Otherwise the lede is kept,
+    then the sentences that share the most words with the heading and query,
+    mention numbers, or quote someone, until the budget is spent. Kept
+    sentences stay in article order and paragraph breaks are preserved.
+    """
+    count = token_counter(model)
+    if count(body) <= budget:
+        return body
+
+    focus = set(tokenize(heading))
+    if query:
+        focus.update(tokenize(query))
+
+    sentences = split_sentences(body)
+
+    def score(position: int) -> float:
+        paragraph, sentence = sentences[position]
+        if paragraph == sentences[0][0] and position < LEDE_SENTENCES:
+            return math.inf
+
+        words = set(tokenize(sentence))
+        overlap = len(words & focus) / math.sqrt(len(words) or 1)
+        return (
+            overlap
+            + bool(NUMBER_PATTERN.search(sentence))
+            + bool(QUOTE_PATTERN.search(sentence))
+        )
+
+    kept: set[int] = set()
+    spent = 0
+    for position in sorted(range(len(sentences)), key=score, reverse=True):
+        cost = count(sentences[position][1]) + 1
+        if spent + cost > budget:
+            continue
+        kept.add(position)
+        spent += cost
+
+    if not kept:
+        # Not even one sentence fits; fall back to a plain cut.
+        return body[: budget * 4]
+
+    paragraphs: dict[int, list[str]] = {}
+    for position in sorted(kept):
+        paragraph, sentence = sentences[position]
+        paragraphs.setdefault(paragraph, []).append(sentence)
+
+    return "\n\n".join(" ".join(parts) for parts in paragraphs.values())
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models.chat_message import ChatMessage
+from src.db.models.chat_sesion import ChatSession
+
+PREVIEW_LENGTH = 200
+
+
+class MessageBuffer:
+    """Write-behind buffer for the ChatMessage rows produced by one chat flow.
+
+    Messages are broadcast immediately and only persisted on `flush()`, in a
+    single multi-row INSERT. `created_at` is stamped when a message is added:
+    rows inserted by one statement would otherwise all share the same
+    transaction timestamp and lose their order. The flush also refreshes each
+    session's denormalized last message preview in the same transaction.
+
+    Because rows land well after their `created_at`, only one flow may write a
+    session at a time, or a poll with an `after`/`since` cursor could move past
+    rows that are still buffered. The job queue runs one flow per session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self._db = db
+        self._rows: list[dict[str, Any]] = []
+
+    def add(
+        self,
+        session_id: UUID,
+        role: str,
+        content: str,
+        message_id: UUID | None = None,
+    ) -> UUID:
+        message_id = message_id or uuid4()
+        now = datetime.now(timezone.utc)
+
+        self._rows.append(
+            {
+                "id": message_id,
+                "session_id": session_id,
+                "role": role,
+                "content": content,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+
+        return message_id
+
+    def discard(self):
+        """Drop the buffered rows, e.g. of an attempt that will be retried."""
+        self._rows = []
+
+    async def flush(self):
+        if not self._rows:
+            return
+
+        rows, self._rows = self._rows, []
+        await self._db.execute(insert(ChatMessage).values(rows))
+
+        latest = {row["session_id"]: row for row in rows}
+        for session_id, row in latest.items():
+            await self._db.execute(
+                update(ChatSession)
+                .where(ChatSession.id == session_id)
+                .values(
+                    last_message_preview=row["content"][:PREVIEW_LENGTH],
+                    updated_at=row["created_at"],
+                )
+            )
+
+        await self._db.commit()
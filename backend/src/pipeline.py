@@ -0,0 +1,296 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from src.config import settings
+from src.dedup import NearDuplicates
+from src.llm.intent import IntentOutput
+from src.llm.summarizer import summarize
+from src.scraper.annapurna_scraper import scrape_news as scrape_annapurna
+from src.scraper.online_khabar_scrape import scrape_news as scrape_online_khabar
+from src.scraper.kathmandupost_scraper import scrape_news as scrape_kathmandupost
+from src.scraper.himalayantime_scraper import scrape_news as scrape_himalayantimes
+from src.scraper.nepalitimes_scraper import scrape_news as scrape_nepalitimes
+from src.scraper.google_search import NewsArticle
+from src.scraper.news_search import search_news
+from src.scraper.types import CachedArticle, ScrapedArticle, ScrapedNews
+from src.scraper.article_cache import article_cache, canonicalize_url
+from src.scraper.extract import MISSING_BODY
+
+Scraper = Callable[[str], Awaitable[ScrapedArticle | None]]
+
+# Process-wide bounds for each stage, shared by every concurrent chat flow.
+scrape_semaphore = asyncio.Semaphore(settings.PIPELINE_SCRAPE_CONCURRENCY)
+summarize_semaphore = asyncio.Semaphore(settings.PIPELINE_SUMMARIZE_CONCURRENCY)
+# Summaries currently waiting for a summarize_semaphore slot.
+summarize_waiting = 0
+
+
+def scraper_for(link: str) -> tuple[Scraper, str] | None:
+    """The site scraper for a link, and the source name it is cited as."""
+    if "english.onlinekhabar.com" in link:
+        return scrape_online_khabar, "Online Khabar"
+    elif "kathmandupost.com" in link:
+        return scrape_kathmandupost, "The Kathmandu Post"
+    elif "thehimalayantimes.com" in link:
+        return scrape_himalayantimes, "The Himalayan Times"
+    elif "nepalitimes.com" in link:
+        return scrape_nepalitimes, "Nepali Times"
+    elif "theannapurnaexpress.com" in link:
+        return scrape_annapurna, "The Annapurna Express"
+
+    return None
+
+
+async def scrape_link(article: NewsArticle) -> ScrapedNews | None:
+    link = article["link"]
+
+    site = scraper_for(link)
+    if site is None:
+        print(f"No scraper available for: {link}")
+        return None
+
+    scraper, source = site
+    result = await scraper(link)
+
+    if result and result["body"] == MISSING_BODY:
+        print(f"No article body found at: {link}")
+        return None
+
+    if result:
+        # Stored in the background so summarizing can start right away.
+        article_cache.set_in_background(link, source, result)
+        return ScrapedNews(
+            title=result["heading"],
+            body=result["body"],
+            date=article["date"],
+            source=source,
+            link=article["link"],
+        )
+
+    return None
+
+
+async def scrape_cached_link(
+    article: NewsArticle, cached: dict[str, CachedArticle]
+) -> ScrapedNews | None:
+    hit = cached.get(canonicalize_url(article["link"]))
+    if hit is None:
+        return await scrape_link(article)
+
+    return ScrapedNews(
+        title=hit["heading"],
+        body=hit["body"],
+        date=article["date"],
+        source=hit["source"],
+        link=article["link"],
+    )
+
+
+async def limited_scrape(
+    article: NewsArticle, cached: dict[str, CachedArticle]
+) -> ScrapedNews | None:
+    async with scrape_semaphore:
+        return await scrape_cached_link(article, cached)
+
+
+async def limited_summarize(
+    article: ScrapedArticle, user_query: str | None = None
+) -> str | None:
+    """Summarize within PIPELINE_SUMMARIZE_CONCURRENCY.
+
+    Once SUMMARIZER_DEGRADE_BACKLOG summaries are already queued, the article
+    is summarized in degraded mode right away instead of joining the queue.
+    """
+    global summarize_waiting
+
+    backlog = settings.SUMMARIZER_DEGRADE_BACKLOG
+    if backlog and summarize_waiting >= backlog:
+        return await summarize(article, user_query, degraded=True)
+
+    summarize_waiting += 1
+    try:
+        await summarize_semaphore.acquire()
+    finally:
+        summarize_waiting -= 1
+
+    try:
+        return await summarize(article, user_query)
+    finally:
+        summarize_semaphore.release()
+
+
+def search_focus(user_query: str, intent: IntentOutput) -> str:
+    """The text search results and scraped articles are ranked against."""
+    return " ".join([intent.search_query or user_query, *intent.entities])
+
+
+class SpeculativeSearch:
+    """News search that can start before intent validation has finished.
+
+    With SPECULATIVE_SEARCH enabled the news search starts immediately, on the
+    raw query, and with SPECULATIVE_SCRAPE its results are scraped right away
+    too. Callers must call `cancel()` once done, so work for a query that
+    turned out to be invalid is dropped. With speculation disabled,
+    `results()` searches with the intent's rewritten query and time window.
+    """
+
+    def __init__(self, user_query: str):
+        self._user_query = user_query
+        self._task: asyncio.Task[list[NewsArticle]] | None = None
+        self.prefetched: dict[str, asyncio.Task[ScrapedNews | None]] = {}
+
+        if settings.SPECULATIVE_SEARCH:
+            self._task = asyncio.create_task(self._search())
+
+    async def _search(self) -> list[NewsArticle]:
+        news_articles = await search_news(self._user_query)
+
+        if settings.SPECULATIVE_SCRAPE and news_articles:
+            cached = await article_cache.get_many(
+                [article["link"] for article in news_articles]
+            )
+            for article in news_articles:
+                self.prefetched[article["link"]] = asyncio.create_task(
+                    limited_scrape(article, cached)
+                )
+
+        return news_articles
+
+    async def results(self, intent: IntentOutput) -> list[NewsArticle]:
+        if self._task is None:
+            return await search_news(
+                intent.search_query or self._user_query,
+                intent.time_window,
+                search_focus(self._user_query, intent),
+            )
+
+        return await self._task
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+
+        for task in self.prefetched.values():
+            task.cancel()
+
+
+async def scrape_and_summarize(
+    news_articles: list[NewsArticle],
+    prefetched: dict[str, asyncio.Task[ScrapedNews | None]] | None = None,
+    user_query: str | None = None,
+) -> AsyncIterator[tuple[ScrapedNews, str | None, str]]:
+    """Scrape and summarize every article, yielding each one as it finishes.
+
+    Each article moves on to summarization as soon as its own scrape is done,
+    so one slow site no longer holds up the rest. Scrapes already started by a
+    SpeculativeSearch are reused through `prefetched`. Articles that could not
+    be scraped are skipped; the summary is None when summarization failed.
+
+    Near-duplicate bodies (the same wire copy on several sites) are only
+    summarized once: every article is yielded with its cluster
+    representative's summary and link.
+    """
+    prefetched = prefetched or {}
+    cached = await article_cache.get_many(
+        [
+            article["link"]
+            for article in news_articles
+            if article["link"] not in prefetched
+        ]
+    )
+    clusters: NearDuplicates[ScrapedNews] = NearDuplicates(
+        settings.DEDUP_MAX_DISTANCE, settings.DEDUP_MIN_TOKENS
+    )
+    summary_tasks: dict[str, asyncio.Task[str | None]] = {}
+
+    async def scrape(article: NewsArticle) -> ScrapedNews | None:
+        prefetch = prefetched.get(article["link"])
+        if prefetch is not None:
+            return await prefetch
+
+        return await limited_scrape(article, cached)
+
+    def representative(scraped: ScrapedNews) -> ScrapedNews:
+        return clusters.representative(scraped["link"], scraped["body"], scraped)
+
+    async def summarize_representative(scraped: ScrapedNews) -> str | None:
+        return await limited_summarize(
+            {
+                "heading": scraped["title"],
+                "body": scraped["body"],
+            },
+            user_query,
+        )
+
+    async def summarize_scraped(
+        scraped: ScrapedNews,
+    ) -> tuple[ScrapedNews, str | None, str]:
+        cluster = representative(scraped)
+
+        task = summary_tasks.get(cluster["link"])
+        if task is None:
+            task = asyncio.create_task(summarize_representative(cluster))
+            summary_tasks[cluster["link"]] = task
+
+        # Shielded: the summary is shared by every article in the cluster.
+        return scraped, await asyncio.shield(task), cluster["link"]
+
+    async def process(
+        article: NewsArticle,
+    ) -> tuple[ScrapedNews, str | None, str] | None:
+        scraped = await scrape(article)
+        if scraped is None:
+            return None
+
+        return await summarize_scraped(scraped)
+
+    tasks = [asyncio.create_task(process(article)) for article in news_articles]
+
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            result = await next_done
+            if result is not None:
+                yield result
+    finally:
+        for task in [*tasks, *summary_tasks.values()]:
+            task.cancel()
+
+
+async def collect_summaries(
+    news_articles: list[NewsArticle],
+    prefetched: dict[str, asyncio.Task[ScrapedNews | None]] | None = None,
+    user_query: str | None = None,
+) -> tuple[int, list[dict[str, str]]]:
+    """Drain scrape_and_summarize.
+
+    Returns how many articles were scraped and the summaries, with their
+    source and link, of the ones that were summarized. A summary shared by
+    near-duplicate articles appears once, with the other articles listed
+    under "also_reported_by" so each outlet can still be cited.
+    """
+    scraped_count = 0
+    summaries_with_sources: list[dict[str, str]] = []
+    by_cluster: dict[str, dict[str, str]] = {}
+
+    async for article, summary, cluster in scrape_and_summarize(
+        news_articles, prefetched, user_query
+    ):
+        scraped_count += 1
+        if summary is None:
+            continue
+
+        entry = by_cluster.get(cluster)
+        if entry is None:
+            entry = {
+                "source": article["source"],
+                "summary": summary,
+                "link": article["link"],
+            }
+            by_cluster[cluster] = entry
+            summaries_with_sources.append(entry)
+        else:
+            also = f"{article['source']} ({article['link']})"
+            previous = entry.get("also_reported_by")
+            entry["also_reported_by"] = f"{previous}; {also}" if previous else also
+
+    return scraped_count, summaries_with_sources
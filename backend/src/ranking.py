@@ -0,0 +1,76 @@
+import re
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    """a about after all also an and any are as at be been before but by can
+    did do does for from had has have how i if in into is it its latest me my
+    new news nepal not of on or our over says said so than that the their them
+    then there these they this to today up was we were what when where which
+    who why will with would you""".split()
+)
+
+# Standard BM25 parameters.
+K1 = 1.5
+B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens without stopwords, with plural "s" stripped."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+
+    return tokens
+
+
+def bm25_scores(query: str, documents: list[str]) -> np.ndarray:
+    """BM25 score of every document against the query.
+
+    IDF comes from the documents themselves, so a term every candidate shares
+    (the topic of the search) counts for little and the terms that tell the
+    candidates apart decide the order. Only the query terms' frequencies are
+    counted; the scoring itself is one vectorized pass over the whole matrix.
+    """
+    terms = sorted(set(tokenize(query)))
+    if not terms or not documents:
+        return np.zeros(len(documents))
+
+    columns = {term: column for column, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)))
+    lengths = np.zeros(len(documents))
+
+    for row, document in enumerate(documents):
+        tokens = tokenize(document)
+        lengths[row] = len(tokens)
+        for token in tokens:
+            column = columns.get(token)
+            if column is not None:
+                tf[row, column] += 1
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((len(documents) - df + 0.5) / (df + 0.5))
+    norm = K1 * (1 - B + B * lengths / max(lengths.mean(), 1.0))
+
+    return (idf * tf * (K1 + 1) / (tf + norm[:, None])).sum(axis=1)
+
+
+def top_k[T](query: str, items: list[T], texts: list[str], k: int) -> list[T]:
+    """The `k` items whose texts score best against the query.
+
+    Ties (including items that match nothing) keep their original order, so
+    with no usable query terms this is just the first `k` items.
+    """
+    if len(items) <= k:
+        return items
+
+    scores = bm25_scores(query, texts)
+    order = np.argsort(-scores, kind="stable")[:k]
+
+    return [items[index] for index in order]
@@ -0,0 +1,133 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any
+
+from realtime._async.channel import AsyncRealtimeChannel
+from realtime._async.client import AsyncRealtimeClient
+
+from src.config import settings
+
+
+class RealtimeManager:
+    """One process-wide Supabase realtime connection shared by every chat flow.
+
+    Session channels are subscribed on first use and kept in an LRU so later
+    queries in the same session reuse them. A failed broadcast on a live
+    connection only drops that session's channel. If the connection itself
+    drops it is rebuilt on the next broadcast; if that fails, broadcasting is
+    skipped for `retry_interval` seconds. Either way `broadcast()` returns
+    False so callers carry on with persistence only.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        max_channels: int,
+        connect_timeout: float,
+        retry_interval: float,
+    ):
+        self._url = f"{url}/realtime/v1"
+        self._api_key = api_key
+        self._max_channels = max_channels
+        self._connect_timeout = connect_timeout
+        self._retry_interval = retry_interval
+        self._client: AsyncRealtimeClient | None = None
+        self._channels: OrderedDict[str, AsyncRealtimeChannel] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._unavailable_until = 0.0
+
+    async def _connected_client(self) -> AsyncRealtimeClient:
+        if self._client is not None and self._client.is_connected:
+            return self._client
+
+        await self._reset()
+
+        client = AsyncRealtimeClient(
+            self._url,
+            token=self._api_key,
+            auto_reconnect=True,
+            max_retries=1,
+        )
+        await asyncio.wait_for(client.connect(), timeout=self._connect_timeout)
+        self._client = client
+
+        return client
+
+    async def _channel(self, topic: str) -> AsyncRealtimeChannel:
+        async with self._lock:
+            client = await self._connected_client()
+
+            channel = self._channels.get(topic)
+            # Errored channels rejoin on their own once the socket is back.
+            if channel is not None and not channel.is_closed:
+                self._channels.move_to_end(topic)
+                return channel
+
+            channel = client.channel(topic)
+            await channel.subscribe()
+            self._channels[topic] = channel
+
+            while len(self._channels) > self._max_channels:
+                _, stale = self._channels.popitem(last=False)
+                await client.remove_channel(stale)
+
+            return channel
+
+    async def _drop_channel(self, client: AsyncRealtimeClient, topic: str):
+        channel = self._channels.pop(topic, None)
+        if channel is None:
+            return
+
+        try:
+            await client.remove_channel(channel)
+        except Exception as e:
+            print(f"Error removing realtime channel {topic}: {e}")
+
+    async def _reset(self):
+        client = self._client
+        self._client = None
+        self._channels.clear()
+
+        if client is not None:
+            try:
+                await client.close()
+            except Exception as e:
+                print(f"Error closing realtime client: {e}")
+
+    async def broadcast(self, topic: str, event: str, data: Any) -> bool:
+        if time.monotonic() < self._unavailable_until:
+            return False
+
+        try:
+            channel = await self._channel(topic)
+            await channel.send_broadcast(event=event, data=data)
+            return True
+
+        except Exception as e:
+            async with self._lock:
+                client = self._client
+                if client is not None and client.is_connected:
+                    # The socket is fine; only this channel is rebuilt next time.
+                    print(f"Realtime broadcast to {topic} failed: {e!r}")
+                    await self._drop_channel(client, topic)
+                    return False
+
+                print(f"Realtime unavailable, persisting only: {e!r}")
+                self._unavailable_until = time.monotonic() + self._retry_interval
+                await self._reset()
+            return False
+
+    async def close(self):
+        async with self._lock:
+            await self._reset()
+
+
+realtimemanager = RealtimeManager(
+    url=settings.SUPABASE_URL,
+    api_key=settings.SUPABASE_API_KEY,
+    max_channels=settings.REALTIME_MAX_CHANNELS,
+    connect_timeout=settings.REALTIME_CONNECT_TIMEOUT,
+    retry_interval=settings.REALTIME_RETRY_INTERVAL,
+)
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import hashlib
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 from uuid import UUID
 from datetime import datetime
 from typing import List
 
-from src.db.pg_session import get_db_session
+from src.db.pg_session import get_db_session, sessionmanager
 from src.db.models.chat_sesion import ChatSession
 from src.db.models.chat_message import ChatMessage
-from src.dependencies import get_current_user
+from src.dependencies import (
+    find_owned_session,
+    get_current_user,
+    get_read_db_session,
+)
 import traceback
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
@@ -23,6 +29,23 @@ class SessionResponse(BaseModel):
     user_id: UUID
 
 
+class SessionListItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    title: str | None
+    last_message_preview: str | None
+    created_at: datetime
+    updated_at: datetime
+
+
+class SessionPageResponse(BaseModel):
+    data: List[SessionListItem]
+    # Pass as `before` to fetch the next (less recently active) page.
+    before: str | None
+    has_more: bool
+
+
 class MessageResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -34,6 +57,30 @@ class MessageResponse(BaseModel):
     updated_at: datetime
 
 
+class MessagePageResponse(BaseModel):
+    data: List[MessageResponse]
+    # Pass as `before` to page further back, or as `after` to poll for newer.
+    before: str | None
+    after: str | None
+    # More messages exist beyond this page in the direction it was read.
+    has_more: bool
+
+
+def encode_cursor(created_at: datetime, message_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{message_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        created_at, message_id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        )
+        return datetime.fromisoformat(created_at), UUID(message_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.post("/", response_model=SessionResponse)
 async def create_session(
     db: AsyncSession = Depends(get_db_session),
@@ -47,6 +94,7 @@ async def create_session(
         db.add(new_session)
         await db.commit()
         await db.refresh(new_session)
+        sessionmanager.mark_written(current_user.id, new_session.id)
 
         return SessionResponse(
             id=new_session.id,
@@ -60,20 +108,74 @@ async def create_session(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{session_id}/messages", response_model=List[MessageResponse])
+@router.get("/", response_model=SessionPageResponse)
+async def list_sessions(
+    limit: int = Query(20, ge=1, le=100),
+    before: str | None = None,
+    db: AsyncSession = Depends(get_read_db_session),
+    current_user=Depends(get_current_user),
+):
+    """List the user's sessions, most recently active first."""
+    try:
+        query = select(ChatSession).where(ChatSession.user_id == UUID(current_user.id))
+
+        if before is not None:
+            query = query.where(
+                tuple_(ChatSession.updated_at, ChatSession.id)
+                < tuple_(*decode_cursor(before))
+            )
+
+        query = query.order_by(ChatSession.updated_at.desc(), ChatSession.id.desc())
+
+        result = await db.execute(query.limit(limit + 1))
+        sessions = list(result.scalars().all())
+
+        has_more = len(sessions) > limit
+        sessions = sessions[:limit]
+
+        return SessionPageResponse(
+            data=[SessionListItem.model_validate(session) for session in sessions],
+            before=(
+                encode_cursor(sessions[-1].updated_at, sessions[-1].id)
+                if has_more
+                else None
+            ),
+            has_more=has_more,
+        )
+
+    except HTTPException:
+        traceback.print_exc()
+        raise
+    except Exception as e:
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{session_id}/messages", response_model=MessagePageResponse)
 async def get_session_messages(
     session_id: UUID,
-    db: AsyncSession = Depends(get_db_session),
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    before: str | None = None,
+    after: str | None = None,
+    since: datetime | None = None,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db_session),
+    primary_db: AsyncSession = Depends(get_db_session),
     current_user=Depends(get_current_user),
 ):
+    """Page through a session's messages with `before`, `after` or `since`."""
     try:
-        result = await db.execute(
-            select(ChatSession).where(
-                ChatSession.id == session_id,
-                ChatSession.user_id == UUID(current_user.id),
+        if sum(param is not None for param in (before, after, since)) > 1:
+            raise HTTPException(
+                status_code=400,
+                detail="Use only one of before, after or since",
             )
+
+        # If the session is only on the primary yet, so are its messages.
+        session, db = await find_owned_session(
+            session_id, current_user.id, db, primary_db
         )
-        session = result.scalar_one_or_none()
 
         if not session:
             raise HTTPException(
@@ -81,14 +183,61 @@ async def get_session_messages(
                 detail="Session not found or you don't have access to it",
             )
 
-        messages_result = await db.execute(
-            select(ChatMessage)
+        # Messages are append-only, so the newest row identifies the history.
+        latest_result = await db.execute(
+            select(ChatMessage.created_at, ChatMessage.id)
             .where(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at)
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+            .limit(1)
+        )
+        latest = latest_result.one_or_none()
+
+        etag_source = f"{session_id}|{latest}|{limit}|{before}|{after}|{since}"
+        etag = f'W/"{hashlib.sha256(etag_source.encode()).hexdigest()[:32]}"'
+        client_etags = [tag.strip() for tag in (if_none_match or "").split(",")]
+        if etag in client_etags:
+            return Response(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+
+        position = tuple_(ChatMessage.created_at, ChatMessage.id)
+        query = select(ChatMessage).where(ChatMessage.session_id == session_id)
+
+        newest_first = after is None and since is None
+        if before is not None:
+            query = query.where(position < tuple_(*decode_cursor(before)))
+        elif after is not None:
+            query = query.where(position > tuple_(*decode_cursor(after)))
+        elif since is not None:
+            query = query.where(ChatMessage.created_at > since)
+
+        if newest_first:
+            query = query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
+        else:
+            query = query.order_by(ChatMessage.created_at, ChatMessage.id)
+
+        messages_result = await db.execute(query.limit(limit + 1))
+        messages = list(messages_result.scalars().all())
+
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if newest_first:
+            messages.reverse()
+
+        return MessagePageResponse(
+            data=[MessageResponse.model_validate(message) for message in messages],
+            before=(
+                encode_cursor(messages[0].created_at, messages[0].id)
+                if messages
+                else before
+            ),
+            after=(
+                encode_cursor(messages[-1].created_at, messages[-1].id)
+                if messages
+                else after
+            ),
+            has_more=has_more,
         )
-        messages = messages_result.scalars().all()
-
-        return messages
 
     except HTTPException:
         traceback.print_exc()
@@ -0,0 +1,190 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from sqlalchemy import or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+from src.cache import LRUCache
+from src.config import settings
+from src.db.models.article import Article
+from src.db.pg_session import sessionmanager
+from src.scraper.extract import MISSING_BODY
+from src.scraper.types import CachedArticle, ScrapedArticle
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "ref",
+    "ref_src",
+    "_ga",
+    "amp",
+    "outputtype",
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """Normalize an article URL so every variant of a story shares one key.
+
+    Forces https and drops `www.`/`amp.`/`m.` host prefixes, `/amp` path
+    segments, tracking query parameters, fragments and trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "amp.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+
+    segments = [segment for segment in parts.path.split("/") if segment]
+    segments = [segment for segment in segments if segment.lower() != "amp"]
+    if segments and segments[-1].lower().endswith(".amp"):
+        segments[-1] = segments[-1][: -len(".amp")]
+    path = "/" + "/".join(segments)
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+class ArticleCache:
+    """Scraped article store: an in-process LRU in front of the `articles` table.
+
+    Entries older than `ttl` seconds are treated as misses and re-scraped,
+    except articles ingested from a feed (`published_at` set): the crawler and
+    local search rely on those, and a published story rarely changes. Database
+    errors never fail a scrape; they are logged and treated as misses.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._ttl = ttl
+        self._lru: LRUCache[str, CachedArticle] = LRUCache(maxsize, ttl)
+        self._writes: set[asyncio.Task[None]] = set()
+
+    async def get_many(self, urls: list[str]) -> dict[str, CachedArticle]:
+        found: dict[str, CachedArticle] = {}
+        missing: list[str] = []
+
+        for url in urls:
+            key = canonicalize_url(url)
+            hit = self._lru.get(key)
+            if hit is not None:
+                found[key] = hit
+            elif key not in missing:
+                missing.append(key)
+
+        if not missing:
+            return found
+
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._ttl)
+
+        try:
+            async with sessionmanager.session() as db:
+                result = await db.execute(
+                    select(Article).where(
+                        Article.url.in_(missing),
+                        or_(
+                            Article.fetched_at >= cutoff,
+                            Article.published_at.is_not(None),
+                        ),
+                    )
+                )
+                rows = result.scalars().all()
+        except Exception as e:
+            print(f"Error reading article cache: {e}")
+            return found
+
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            cached: CachedArticle = {
+                "heading": row.title,
+                "body": row.body,
+                "source": row.source,
+            }
+            remaining = self._ttl
+            if row.published_at is None:
+                remaining -= (now - row.fetched_at).total_seconds()
+            self._lru.set(row.url, cached, ttl=remaining)
+            found[row.url] = cached
+
+        return found
+
+    async def set(
+        self,
+        url: str,
+        source: str,
+        article: ScrapedArticle,
+        published_at: datetime | None = None,
+    ):
+        if article["body"] == MISSING_BODY:
+            return
+
+        key = canonicalize_url(url)
+        self._lru.set(
+            key,
+            {"heading": article["heading"], "body": article["body"], "source": source},
+        )
+
+        values = {
+            "url": key,
+            "link": url,
+            "source": source,
+            "title": article["heading"],
+            "body": article["body"],
+            "published_at": published_at,
+        }
+        statement = insert(Article).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Article.url],
+            set_={
+                "link": statement.excluded.link,
+                "source": statement.excluded.source,
+                "title": statement.excluded.title,
+                "body": statement.excluded.body,
+                "published_at": func.coalesce(
+                    statement.excluded.published_at, Article.published_at
+                ),
+                "fetched_at": func.now(),
+                "updated_at": func.now(),
+            },
+        )
+
+        try:
+            async with sessionmanager.session() as db:
+                await db.execute(statement)
+                await db.commit()
+        except Exception as e:
+            print(f"Error writing article cache: {e}")
+
+    def set_in_background(
+        self,
+        url: str,
+        source: str,
+        article: ScrapedArticle,
+        published_at: datetime | None = None,
+    ):
+        """`set` without waiting for the database write; see `drain`."""
+        task = asyncio.create_task(self.set(url, source, article, published_at))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def drain(self):
+        """Wait for pending background writes, before the pool is closed."""
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+
+
+article_cache = ArticleCache(
+    maxsize=settings.ARTICLE_CACHE_MAXSIZE,
+    ttl=settings.ARTICLE_CACHE_TTL_SECONDS,
+)
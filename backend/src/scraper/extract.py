@@ -0,0 +1,141 @@
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.util import find_spec
+from multiprocessing import get_context
+
+from bs4 import BeautifulSoup
+
+from src.config import settings
+from src.scraper.types import ArticleSelectors, ScrapedArticle
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+MISSING_HEADING = "No heading found"
+MISSING_BODY = "No body content found"
+
+
+def extract_with_selectolax(html: str, selectors: ArticleSelectors) -> ScrapedArticle:
+    if LexborHTMLParser is None:
+        raise RuntimeError("selectolax is not installed")
+
+    tree = LexborHTMLParser(html)
+
+    heading_tag = tree.css_first(selectors["heading"])
+    heading = heading_tag.text(strip=True) if heading_tag else MISSING_HEADING
+
+    body_container = tree.css_first(selectors["body"])
+    if body_container is None:
+        return {"heading": heading, "body": MISSING_BODY}
+
+    paragraphs = [p.text(strip=True) for p in body_container.css("p")]
+    return {"heading": heading, "body": "\n\n".join(paragraphs)}
+
+
+def extract_with_soup(
+    html: str, selectors: ArticleSelectors, features: str
+) -> ScrapedArticle:
+    soup = BeautifulSoup(html, features)
+
+    heading_tag = soup.select_one(selectors["heading"])
+    heading = heading_tag.get_text(strip=True) if heading_tag else MISSING_HEADING
+
+    body_container = soup.select_one(selectors["body"])
+    if body_container is None:
+        return {"heading": heading, "body": MISSING_BODY}
+
+    paragraphs = [p.get_text(strip=True) for p in body_container.find_all("p")]
+    return {"heading": heading, "body": "\n\n".join(paragraphs)}
+
+
+def extract_with_lxml(html: str, selectors: ArticleSelectors) -> ScrapedArticle:
+    return extract_with_soup(html, selectors, "lxml")
+
+
+def extract_with_html_parser(html: str, selectors: ArticleSelectors) -> ScrapedArticle:
+    return extract_with_soup(html, selectors, "html.parser")
+
+
+EXTRACTORS: dict[str, Callable[[str, ArticleSelectors], ScrapedArticle]] = {
+    "selectolax": extract_with_selectolax,
+    "lxml": extract_with_lxml,
+    "html.parser": extract_with_html_parser,
+}
+
+
+def available_parsers() -> list[str]:
+    """Installed backends, fastest first."""
+    parsers = []
+    if LexborHTMLParser is not None:
+        parsers.append("selectolax")
+    if find_spec("lxml") is not None:
+        parsers.append("lxml")
+    parsers.append("html.parser")
+
+    return parsers
+
+
+def extract_article(
+    html: str, selectors: ArticleSelectors, parser: str
+) -> ScrapedArticle:
+    """Pull the heading and body paragraphs out of an article page.
+
+    Every backend takes the same CSS selectors and returns the same text;
+    only the parser building the tree differs. Runs in an executor worker.
+    """
+    return EXTRACTORS[parser](html, selectors)
+
+
+class HTMLExtractor:
+    """Runs article extraction off the event loop.
+
+    A thread pool is the default: lexbor and libxml2 release the GIL while
+    parsing. `executor="process"` moves the whole extraction (including the
+    Python-side tree walk) to worker processes. `parser` picks the backend,
+    falling back to the fastest available one if it isn't installed.
+    """
+
+    def __init__(self, parser: str, executor: str, workers: int):
+        parsers = available_parsers()
+        if parser not in parsers:
+            print(f"HTML parser {parser!r} unavailable, using {parsers[0]!r}")
+            parser = parsers[0]
+
+        self.parser = parser
+        self._executor_kind = executor
+        self._workers = workers
+        self._executor: Executor | None = None
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self._executor_kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers, mp_context=get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._workers, thread_name_prefix="html-extract"
+                )
+
+        return self._executor
+
+    async def extract(self, html: str, selectors: ArticleSelectors) -> ScrapedArticle:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool(), extract_article, html, selectors, self.parser
+        )
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+html_extractor = HTMLExtractor(
+    parser=settings.HTML_PARSER,
+    executor=settings.HTML_PARSE_EXECUTOR,
+    workers=settings.HTML_PARSE_WORKERS,
+)
@@ -1,6 +1,15 @@
-import httpx
 from typing import Dict, Any, List, TypedDict
 from src.config import settings
+from src.http_client import httpmanager
+from src.scraper.types import TimeWindow
+
+# Google's "tbs" date restriction for each time window.
+TIME_WINDOW_TBS: Dict[TimeWindow, str] = {
+    "day": "qdr:d",
+    "week": "qdr:w",
+    "month": "qdr:m",
+    "year": "qdr:y",
+}
 
 
 class SearchResult(TypedDict, total=False):
@@ -21,12 +30,15 @@ class NewsArticle(TypedDict):
     title: str
     link: str
     date: str
+    snippet: str
 
 
-async def search_google(query: str) -> SearchResponse:
+async def search_google(query: str, tbs: str | None = None) -> SearchResponse:
     url: str = settings.SERPER_API_URL
 
     payload: Dict[str, str] = {"q": query, "gl": "np"}
+    if tbs:
+        payload["tbs"] = tbs
 
     headers: Dict[str, str] = {
         "X-API-KEY": settings.SERPER_API_KEY,
@@ -34,22 +46,24 @@ async def search_google(query: str) -> SearchResponse:
     }
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url, headers=headers, json=payload, timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        client = httpmanager.client(url)
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        return response.json()
 
     except Exception as e:
         print(f"Error searching Google: {e}")
         return {"error": str(e)}
 
 
-async def search_nepal_news(topic: str) -> List[NewsArticle]:
+async def search_nepal_news(
+    topic: str, time_window: TimeWindow = "any"
+) -> List[NewsArticle]:
     query: str = f"{topic} (site:english.onlinekhabar.com OR site:kathmandupost.com OR site:thehimalayantimes.com OR site:nepalitimes.com OR site:theannapurnaexpress.com)"
 
-    search_results: SearchResponse = await search_google(query)
+    search_results: SearchResponse = await search_google(
+        query, TIME_WINDOW_TBS.get(time_window)
+    )
 
     if "error" in search_results:
         return []
@@ -62,6 +76,7 @@ async def search_nepal_news(topic: str) -> List[NewsArticle]:
             "title": result.get("title", ""),
             "link": result.get("link", ""),
             "date": result.get("date", ""),
+            "snippet": result.get("snippet", ""),
         }
         news_articles.append(article)
 
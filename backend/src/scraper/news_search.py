@@ -0,0 +1,123 @@
+from datetime import timedelta
+from typing import List
+
+from sqlalchemy import cast, func, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+
+from src.config import settings
+from src.db.models.article import Article
+from src.db.pg_session import sessionmanager
+from src.ranking import top_k
+from src.scraper.article_cache import canonicalize_url
+from src.scraper.google_search import NewsArticle, search_nepal_news
+from src.scraper.types import TimeWindow
+
+SNIPPET_LENGTH = 300
+
+TIME_WINDOW_DAYS: dict[TimeWindow, int] = {
+    "day": 1,
+    "week": 7,
+    "month": 31,
+    "year": 366,
+}
+
+
+async def search_local_news(
+    topic: str, limit: int, time_window: TimeWindow = "any"
+) -> List[NewsArticle]:
+    """Full-text search over stored articles, ranked by relevance and recency.
+
+    Matches use `websearch_to_tsquery` against the title-weighted
+    `search_vector` (GIN indexed). The text rank is divided by
+    `1 + age / LOCAL_SEARCH_RECENCY_DAYS`, so a story that old scores half of
+    an equally relevant one published today. Articles older than the
+    `time_window` are left out.
+    """
+    query = func.websearch_to_tsquery(cast("english", REGCONFIG), topic)
+    published = func.coalesce(Article.published_at, Article.fetched_at)
+    age_days = func.extract("epoch", func.now() - published) / 86400
+    score = func.ts_rank_cd(Article.search_vector, query) / (
+        1 + age_days / settings.LOCAL_SEARCH_RECENCY_DAYS
+    )
+
+    statement = (
+        select(
+            Article.link,
+            Article.title,
+            published.label("published"),
+            func.left(Article.body, SNIPPET_LENGTH).label("snippet"),
+        )
+        .where(Article.search_vector.op("@@")(query))
+        .order_by(score.desc())
+        .limit(limit)
+    )
+
+    if time_window in TIME_WINDOW_DAYS:
+        since = func.now() - timedelta(days=TIME_WINDOW_DAYS[time_window])
+        statement = statement.where(published >= since)
+
+    try:
+        async with sessionmanager.session(replica=True) as db:
+            rows = (await db.execute(statement)).all()
+    except Exception as e:
+        print(f"Error searching local articles: {e}")
+        return []
+
+    return [
+        {
+            "title": row.title,
+            "link": row.link,
+            "date": row.published.strftime("%b %d, %Y"),
+            "snippet": row.snippet,
+        }
+        for row in rows
+    ]
+
+
+async def search_backend(
+    topic: str, time_window: TimeWindow = "any"
+) -> List[NewsArticle]:
+    if settings.SEARCH_BACKEND == "serper":
+        return await search_nepal_news(topic, time_window)
+
+    local_articles = await search_local_news(
+        topic, settings.SEARCH_MAX_RESULTS, time_window
+    )
+    if (
+        settings.SEARCH_BACKEND == "local"
+        or len(local_articles) >= settings.LOCAL_SEARCH_MIN_RESULTS
+    ):
+        return local_articles
+
+    news_articles = await search_nepal_news(topic, time_window)
+    seen = {canonicalize_url(article["link"]) for article in news_articles}
+    for article in local_articles:
+        if canonicalize_url(article["link"]) not in seen:
+            news_articles.append(article)
+
+    return news_articles
+
+
+async def search_news(
+    topic: str, time_window: TimeWindow = "any", focus: str | None = None
+) -> List[NewsArticle]:
+    """Find articles for a topic with the configured SEARCH_BACKEND.
+
+    "serper" and "local" use one backend only. "tiered" searches the local
+    index first and only calls Serper when that finds fewer than
+    LOCAL_SEARCH_MIN_RESULTS articles, adding the local hits to the
+    Serper results. Both backends only look back as far as `time_window`,
+    and search without it when that finds nothing. Only the
+    RANK_SCRAPE_TOP_K results whose title and snippet best match `focus`
+    (the topic itself by default) are returned.
+    """
+    news_articles = await search_backend(topic, time_window)
+    if not news_articles and time_window != "any":
+        news_articles = await search_backend(topic, "any")
+
+    return top_k(
+        focus or topic,
+        news_articles,
+        [f"{article['title']} {article['snippet']}" for article in news_articles],
+        settings.RANK_SCRAPE_TOP_K,
+    )
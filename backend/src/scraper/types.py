@@ -1,4 +1,7 @@
-from typing import TypedDict
+from typing import Literal, TypedDict
+
+# How far back a news search should look.
+TimeWindow = Literal["any", "day", "week", "month", "year"]
 
 
 class ScrapedNews(TypedDict):
@@ -12,3 +15,12 @@ class ScrapedNews(TypedDict):
 class ScrapedArticle(TypedDict):
     heading: str
     body: str
+
+
+class CachedArticle(ScrapedArticle):
+    source: str
+
+
+class ArticleSelectors(TypedDict):
+    heading: str
+    body: str
@@ -0,0 +1,84 @@
+import asyncio
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+
+
+class Flight[T]:
+    """The events of one run so far, and whether (and how) it finished."""
+
+    def __init__(self):
+        self.events: list[T] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self.subscribers = 0
+        self.task: asyncio.Task[None] | None = None
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self):
+        await self._changed.wait()
+
+
+class SingleFlight[K, T]:
+    """Coalesces concurrent runs of an event stream that share a key.
+
+    The first caller for a key starts the run; callers arriving while it is
+    in flight attach to it instead of starting their own. Every subscriber
+    gets every event from the start, then follows the run live, and sees the
+    run's exception if it fails. The run is cancelled once its last subscriber
+    leaves. Finished runs are forgotten, so the next caller starts afresh.
+    """
+
+    def __init__(self):
+        self._flights: dict[K, Flight[T]] = {}
+
+    def in_flight(self, key: K) -> bool:
+        return key in self._flights
+
+    async def join(
+        self, key: K, run: Callable[[], AsyncIterator[T]]
+    ) -> AsyncGenerator[T, None]:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._run(key, flight, run()))
+
+        flight.subscribers += 1
+        try:
+            index = 0
+            while True:
+                while index < len(flight.events):
+                    yield flight.events[index]
+                    index += 1
+
+                if flight.done:
+                    if flight.error is not None:
+                        raise flight.error
+                    return
+
+                await flight.wait()
+        finally:
+            flight.subscribers -= 1
+            if not flight.subscribers and not flight.done:
+                if flight.task is not None:
+                    flight.task.cancel()
+                self._forget(key, flight)
+
+    async def _run(self, key: K, flight: Flight[T], events: AsyncIterator[T]):
+        try:
+            async for event in events:
+                flight.events.append(event)
+                flight.notify()
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            flight.notify()
+            self._forget(key, flight)
+
+    def _forget(self, key: K, flight: Flight[T]):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
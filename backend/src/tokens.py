@@ -0,0 +1,137 @@
+import asyncio
+import time
+from typing import Any
+
+import httpx
+import jwt
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel
+
+from src.cache import LRUCache
+from src.config import settings
+from src.http_client import httpmanager
+from src.supabase import supabase_client
+
+# Unknown key ids force a JWKS refetch (key rotation), at most this often.
+JWKS_MIN_REFRESH_INTERVAL = 30.0
+
+
+class AuthenticatedUser(BaseModel):
+    id: str
+    email: str | None = None
+    role: str | None = None
+
+
+class TokenVerifier:
+    """Verifies Supabase access tokens without a round trip per request.
+
+    HS256 tokens are checked against the project's JWT secret, asymmetric ones
+    against the project's JWKS (fetched once and refreshed every `jwks_ttl`
+    seconds, or sooner when an unknown key id shows up). Verified users are
+    cached per token until the token expires. When a token can't be checked
+    locally (e.g. HS256 without a configured secret) it falls back to
+    `auth.get_user`, run in a worker thread so it doesn't block the loop.
+    """
+
+    def __init__(
+        self,
+        jwt_secret: str | None,
+        jwks_url: str,
+        audience: str,
+        jwks_ttl: float,
+        cache_maxsize: int,
+    ):
+        self._jwt_secret = jwt_secret
+        self._jwks_url = jwks_url
+        self._audience = audience
+        self._jwks_ttl = jwks_ttl
+        self._jwks: dict[str, jwt.PyJWK] = {}
+        self._jwks_fetched_at = 0.0
+        self._jwks_lock = asyncio.Lock()
+        self._users: LRUCache[str, AuthenticatedUser] = LRUCache(cache_maxsize)
+
+    async def _refresh_jwks(self, force: bool = False):
+        async with self._jwks_lock:
+            fetched_ago = time.monotonic() - self._jwks_fetched_at
+            max_age = JWKS_MIN_REFRESH_INTERVAL if force else self._jwks_ttl
+            if fetched_ago < max_age:
+                return
+
+            client = httpmanager.client(self._jwks_url)
+            response = await client.get(self._jwks_url)
+            response.raise_for_status()
+
+            keys: dict[str, jwt.PyJWK] = {}
+            for data in response.json().get("keys", []):
+                try:
+                    keys[data.get("kid", "")] = jwt.PyJWK(data)
+                except jwt.PyJWKError as e:
+                    print(f"Skipping unusable JWK {data.get('kid')}: {e}")
+
+            self._jwks = keys
+            self._jwks_fetched_at = time.monotonic()
+
+    async def _signing_key(self, header: dict[str, Any]) -> tuple[Any, str] | None:
+        if header.get("alg") == "HS256":
+            return (self._jwt_secret, "HS256") if self._jwt_secret else None
+
+        kid = header.get("kid", "")
+        try:
+            await self._refresh_jwks()
+            if kid not in self._jwks:
+                await self._refresh_jwks(force=True)
+        except httpx.HTTPError as e:
+            print(f"Error fetching JWKS: {e}")
+
+        jwk = self._jwks.get(kid)
+        return (jwk.key, jwk.algorithm_name) if jwk else None
+
+    async def _remote_verify(self, token: str) -> AuthenticatedUser | None:
+        response = await run_in_threadpool(supabase_client.auth.get_user, token)
+        if not response or not response.user:
+            return None
+
+        user = response.user
+        return AuthenticatedUser(id=user.id, email=user.email, role=user.role)
+
+    async def verify(self, token: str) -> AuthenticatedUser | None:
+        user = self._users.get(token)
+        if user is not None:
+            return user
+
+        signing_key = await self._signing_key(jwt.get_unverified_header(token))
+
+        if signing_key is None:
+            user = await self._remote_verify(token)
+            if user is None:
+                return None
+
+            # Supabase has vouched for the token; only its expiry is read here.
+            claims = jwt.decode(token, options={"verify_signature": False})
+        else:
+            key, algorithm = signing_key
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=[algorithm],
+                audience=self._audience,
+                options={"require": ["exp", "sub"]},
+            )
+            user = AuthenticatedUser(
+                id=claims["sub"],
+                email=claims.get("email"),
+                role=claims.get("role"),
+            )
+
+        self._users.set(token, user, ttl=claims.get("exp", 0) - time.time())
+
+        return user
+
+
+token_verifier = TokenVerifier(
+    jwt_secret=settings.SUPABASE_JWT_SECRET,
+    jwks_url=f"{settings.SUPABASE_URL}/auth/v1/.well-known/jwks.json",
+    audience=settings.SUPABASE_JWT_AUDIENCE,
+    jwks_ttl=settings.SUPABASE_JWKS_TTL_SECONDS,
+    cache_maxsize=settings.AUTH_TOKEN_CACHE_MAXSIZE,
+)
@@ -0,0 +1,84 @@
+"""Train the local intent classifier on the LLM verdicts in intent_verdicts.
+
+    uv run train_intent.py --output intent_model.npz
+
+Point INTENT_MODEL_PATH at the output to enable it.
+"""
+
+import argparse
+import asyncio
+import random
+
+from sqlalchemy import select
+
+from src.config import settings
+from src.db.models.intent_verdict import IntentVerdict
+from src.db.pg_session import sessionmanager
+from src.llm.intent_classifier import IntentModel
+
+
+async def load_examples() -> list[tuple[str, bool]]:
+    """(normalized query, is_valid) pairs, the latest verdict per query."""
+    statement = select(IntentVerdict.query, IntentVerdict.is_valid).order_by(
+        IntentVerdict.created_at
+    )
+
+    try:
+        async with sessionmanager.session() as db:
+            rows = (await db.execute(statement)).all()
+    finally:
+        await sessionmanager.close()
+
+    return list({row.query: row.is_valid for row in rows}.items())
+
+
+def report(model: IntentModel, examples: list[tuple[str, bool]]):
+    """Accuracy overall, and coverage and accuracy at the configured thresholds."""
+    decided = correct = confident_correct = 0
+    for query, label in examples:
+        probability = model.probability(query)
+        correct += (probability >= 0.5) == label
+
+        if probability >= settings.INTENT_LOCAL_VALID_CONFIDENCE:
+            decided += 1
+            confident_correct += label
+        elif probability <= 1 - settings.INTENT_LOCAL_INVALID_CONFIDENCE:
+            decided += 1
+            confident_correct += not label
+
+    print(f"held-out accuracy: {correct / len(examples):.3f} on {len(examples)}")
+    if decided:
+        print(
+            f"decided locally: {decided / len(examples):.3f}, "
+            f"accuracy {confident_correct / decided:.3f}"
+        )
+    else:
+        print("decided locally: none")
+
+
+def main(output: str, holdout: float):
+    examples = asyncio.run(load_examples())
+    if not examples:
+        print("No verdicts to train on")
+        return
+
+    random.Random(0).shuffle(examples)
+    split = int(len(examples) * holdout)
+    if split:
+        report(IntentModel.train(examples[split:]), examples[:split])
+
+    IntentModel.train(examples).save(output)
+    print(f"Trained on {len(examples)} verdicts, saved to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Train the local intent classifier on the LLM verdicts."
+    )
+    parser.add_argument(
+        "--output", default=settings.INTENT_MODEL_PATH or "intent_model.npz"
+    )
+    parser.add_argument("--holdout", type=float, default=0.1)
+    args = parser.parse_args()
+
+    main(args.output, args.holdout)
@@ -0,0 +1,124 @@
+import asyncio
+import signal
+import traceback
+
+from sqlalchemy import Row
+
+from src.chat import send_message, start_chat_flow
+from src.config import settings
+from src.db.pg_session import sessionmanager
+from src.http_client import httpmanager
+from src.jobs import (
+    claim_chat_job,
+    complete_chat_job,
+    fail_chat_job,
+    fail_expired_chat_jobs,
+)
+from src.message_buffer import MessageBuffer
+from src.realtime import realtimemanager
+from src.scraper.article_cache import article_cache
+from src.scraper.extract import html_extractor
+
+
+async def report_failure(job: Row):
+    async with sessionmanager.session() as db:
+        messages = MessageBuffer(db)
+        await send_message(
+            messages,
+            job.session_id,
+            "Something went wrong while generating your response.",
+        )
+        await messages.flush()
+
+
+async def run_job(job: Row):
+    final_attempt = job.attempts >= job.max_attempts
+
+    try:
+        async with sessionmanager.session() as db:
+            await asyncio.wait_for(
+                start_chat_flow(
+                    session_id=job.session_id,
+                    user_query=job.user_query,
+                    db=db,
+                    final_attempt=final_attempt,
+                ),
+                timeout=settings.JOB_TIMEOUT_SECONDS,
+            )
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        print(
+            f"Chat job {job.id} failed (attempt {job.attempts}/{job.max_attempts}): {error}"
+        )
+
+        if not await fail_chat_job(job, error):
+            await report_failure(job)
+        return
+
+    await complete_chat_job(job.id)
+
+
+async def run_worker(stop: asyncio.Event):
+    slots = asyncio.Semaphore(settings.JOB_WORKER_CONCURRENCY)
+    running: set[asyncio.Task] = set()
+
+    def on_done(task: asyncio.Task):
+        running.discard(task)
+        slots.release()
+        if not task.cancelled() and task.exception():
+            traceback.print_exception(task.exception())
+
+    while not stop.is_set():
+        await slots.acquire()
+
+        try:
+            job = await claim_chat_job()
+        except Exception:
+            traceback.print_exc()
+            job = None
+
+        if job is None:
+            slots.release()
+            try:
+                for expired in await fail_expired_chat_jobs():
+                    print(f"Chat job {expired.id} failed: its final lease expired")
+                    await report_failure(expired)
+            except Exception:
+                traceback.print_exc()
+
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.JOB_POLL_INTERVAL)
+            except TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(run_job(job))
+        running.add(task)
+        task.add_done_callback(on_done)
+
+    # Let in-flight jobs finish; anything cut short by a hard kill is picked
+    # up again once its lease expires.
+    await asyncio.gather(*running, return_exceptions=True)
+
+
+async def main():
+    stop = asyncio.Event()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"Chat worker started with {settings.JOB_WORKER_CONCURRENCY} slots")
+
+    try:
+        await run_worker(stop)
+    finally:
+        await realtimemanager.close()
+        await httpmanager.close()
+        await article_cache.drain()
+        await sessionmanager.close()
+        html_extractor.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())